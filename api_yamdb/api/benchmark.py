@@ -0,0 +1,374 @@
+import statistics
+import time
+from collections import namedtuple
+from itertools import count
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.urls import get_resolver
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from users.authentication import RoleAccessToken
+from .timing import QueryTimer
+
+NAMESPACES = ('api', 'users')
+TITLES = '/api/v1/titles/'
+TITLE = TITLES + '{ctx.title_id}/'
+REVIEWS = TITLE + 'reviews/'
+REVIEW = REVIEWS + '{ctx.review_id}/'
+COMMENTS = REVIEW + 'comments/'
+
+Endpoint = namedtuple(
+    'Endpoint',
+    ('name', 'route', 'role', 'method', 'prepare', 'max_iterations'),
+    defaults=(None,)
+)
+Sample = namedtuple(
+    'Sample', ('url', 'status', 'ms', 'queries', 'sql_ms', 'bytes')
+)
+
+
+def get(url):
+    return lambda ctx: (url.format(ctx=ctx), None)
+
+
+ENDPOINTS = (
+    Endpoint('api-root', 'api-root', 'user', 'get', get('/api/v1/')),
+    Endpoint('category-list', 'category-list', 'anonymous', 'get',
+             get('/api/v1/categories/')),
+    Endpoint('category-search', 'category-list', 'anonymous', 'get',
+             get('/api/v1/categories/?search={ctx.category_name}')),
+    Endpoint('category-create', 'category-list', 'admin', 'post',
+             lambda ctx: ctx.reference_data('/api/v1/categories/')),
+    Endpoint('category-destroy', 'category-detail', 'admin', 'delete',
+             lambda ctx: (
+                 f'/api/v1/categories/{ctx.new_reference(Category)}/', None
+             )),
+    Endpoint('genre-list', 'genre-list', 'anonymous', 'get',
+             get('/api/v1/genres/')),
+    Endpoint('genre-create', 'genre-list', 'admin', 'post',
+             lambda ctx: ctx.reference_data('/api/v1/genres/')),
+    Endpoint('genre-destroy', 'genre-detail', 'admin', 'delete',
+             lambda ctx: (
+                 f'/api/v1/genres/{ctx.new_reference(Genre)}/', None
+             )),
+    Endpoint('title-list', 'title-list', 'anonymous', 'get', get(TITLES)),
+    Endpoint('title-filter', 'title-list', 'anonymous', 'get',
+             get(TITLES + '?genre={ctx.genre_slug}'
+                 '&category={ctx.category_slug}')),
+    Endpoint('title-facets', 'title-list', 'anonymous', 'get',
+             get(TITLES + '?facets=category,genre,year')),
+    Endpoint('title-facets-filter', 'title-list', 'anonymous', 'get',
+             get(TITLES + '?facets=category,genre,year'
+                 '&genre={ctx.genre_slug}')),
+    Endpoint('title-search', 'title-list', 'anonymous', 'get',
+             get(TITLES + '?q={ctx.search_word}')),
+    Endpoint('title-create', 'title-list', 'admin', 'post',
+             lambda ctx: (TITLES, ctx.title_data())),
+    Endpoint('title-bulk-create', 'title-bulk', 'admin', 'post',
+             lambda ctx: (
+                 TITLES + 'bulk/', [ctx.title_data() for _ in range(100)]
+             ), 10),
+    Endpoint('title-bulk-update', 'title-bulk', 'admin', 'patch',
+             lambda ctx: (TITLES + 'bulk/', [
+                 {'id': title_id, 'category': ctx.category_slug}
+                 for title_id in ctx.title_ids[:100]
+             ])),
+    Endpoint('title-detail', 'title-detail', 'anonymous', 'get', get(TITLE)),
+    Endpoint('title-batch', 'title-batch', 'anonymous', 'get',
+             lambda ctx: (TITLES + 'batch/', {'ids': ctx.batch_ids()})),
+    Endpoint('title-partial-update', 'title-detail', 'admin', 'patch',
+             lambda ctx: (TITLE.format(ctx=ctx), {'name': ctx.name()})),
+    Endpoint('title-destroy', 'title-detail', 'admin', 'delete',
+             lambda ctx: (f'{TITLES}{ctx.new_title()}/', None)),
+    Endpoint('review-list', 'review-list', 'anonymous', 'get',
+             get(REVIEWS)),
+    Endpoint('review-list-cursor', 'review-list', 'anonymous', 'get',
+             get(REVIEWS + '?pagination=cursor')),
+    Endpoint('review-create', 'review-list', 'user', 'post',
+             lambda ctx: (
+                 f'{TITLES}{ctx.free_title()}/reviews/',
+                 {'text': ctx.name(), 'score': 7}
+             )),
+    Endpoint('review-detail', 'review-detail', 'anonymous', 'get',
+             get(REVIEW)),
+    Endpoint('review-partial-update', 'review-detail', 'admin', 'patch',
+             lambda ctx: (REVIEW.format(ctx=ctx), {'text': ctx.name()})),
+    Endpoint('review-destroy', 'review-detail', 'admin', 'delete',
+             lambda ctx: (ctx.new_review(), None)),
+    Endpoint('comment-list', 'comment-list', 'anonymous', 'get',
+             get(COMMENTS)),
+    Endpoint('comment-create', 'comment-list', 'user', 'post',
+             lambda ctx: (COMMENTS.format(ctx=ctx), {'text': ctx.name()})),
+    Endpoint('comment-detail', 'comment-detail', 'anonymous', 'get',
+             get(COMMENTS + '{ctx.comment_id}/')),
+    Endpoint('comment-partial-update', 'comment-detail', 'admin', 'patch',
+             lambda ctx: (
+                 COMMENTS.format(ctx=ctx) + f'{ctx.comment_id}/',
+                 {'text': ctx.name()}
+             )),
+    Endpoint('comment-destroy', 'comment-detail', 'admin', 'delete',
+             lambda ctx: (ctx.new_comment(), None)),
+    Endpoint('users-list', 'users-list', 'admin', 'get',
+             get('/api/v1/users/')),
+    Endpoint('users-create', 'users-list', 'admin', 'post',
+             lambda ctx: ('/api/v1/users/', ctx.user_data())),
+    Endpoint('users-detail', 'users-detail', 'admin', 'get',
+             get('/api/v1/users/{ctx.user.username}/')),
+    Endpoint('users-partial-update', 'users-detail', 'admin', 'patch',
+             lambda ctx: (
+                 f'/api/v1/users/{ctx.user.username}/', {'bio': ctx.name()}
+             )),
+    Endpoint('users-destroy', 'users-detail', 'admin', 'delete',
+             lambda ctx: (f'/api/v1/users/{ctx.new_user()}/', None)),
+    Endpoint('users-me', 'users-get-patch-me', 'user', 'get',
+             get('/api/v1/users/me/')),
+    Endpoint('users-me-update', 'users-get-patch-me', 'user', 'patch',
+             lambda ctx: ('/api/v1/users/me/', {'bio': ctx.name()})),
+    Endpoint('export-titles', 'export_titles', 'admin', 'get',
+             get('/api/v1/export/titles/'), 5),
+    Endpoint('export-reviews', 'export_reviews', 'admin', 'get',
+             get('/api/v1/export/reviews/'), 5),
+    Endpoint('export-comments', 'export_comments', 'admin', 'get',
+             get('/api/v1/export/comments/'), 5),
+    Endpoint('search', 'search', 'anonymous', 'get',
+             get('/api/v1/search/?q={ctx.search_word}')),
+    Endpoint('signup', 'signup', 'anonymous', 'post',
+             lambda ctx: ('/api/v1/auth/signup/', ctx.user_data())),
+    Endpoint('get-token', 'get_token', 'anonymous', 'post',
+             lambda ctx: ('/api/v1/auth/token/', {
+                 'username': ctx.user.username,
+                 'confirmation_code': ctx.user.confirmation_code,
+             })),
+)
+
+
+def route_names():
+    resolver = get_resolver()
+    return {
+        name
+        for namespace in NAMESPACES
+        for name in resolver.namespace_dict[namespace][1].reverse_dict
+        if isinstance(name, str)
+    }
+
+
+def uncovered_routes(endpoints=ENDPOINTS):
+    return sorted(route_names() - {endpoint.route for endpoint in endpoints})
+
+
+def percentiles(values):
+    if len(values) < 2:
+        return values * 3
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return cuts[49], cuts[94], cuts[98]
+
+
+class BenchmarkContext:
+
+    def __init__(self):
+        self.counter = count(1)
+        self.admin = User.objects.create(
+            username='benchmark_admin', email='benchmark_admin@yamdb.fake',
+            role=settings.ADMIN
+        )
+        self.user = User.objects.create(
+            username='benchmark_user', email='benchmark_user@yamdb.fake',
+            confirmation_code='benchmark'
+        )
+        title = Title.objects.order_by('-score_count', 'id').first()
+        if title is None:
+            raise ValueError('Для замеров нужно хотя бы одно произведение.')
+        self.title_id = title.pk
+        self.title_ids = list(Title.objects.values_list('id', flat=True))
+        review = Review.objects.filter(title=title).annotate(
+            comments_count=Count('comments')
+        ).order_by('-comments_count', 'id').first() or Review.objects.create(
+            title=title, author=self.admin, text='Отзыв', score=5
+        )
+        self.review_id = review.pk
+        self.comment_id = Comment.objects.filter(
+            review=review
+        ).values_list('id', flat=True).first() or Comment.objects.create(
+            review=review, author=self.admin, text='Комментарий'
+        ).pk
+        category = Category.objects.order_by('id').first()
+        self.category_slug = category.slug if category else ''
+        self.category_name = category.name if category else ''
+        genre = Genre.objects.order_by('id').first()
+        self.genre_slug = genre.slug if genre else ''
+        words = review.text.split()
+        self.search_word = words[0] if words else 'отзыв'
+
+    def next(self):
+        return next(self.counter)
+
+    def name(self):
+        return f'Замер {self.next()}'
+
+    def reference_data(self, url):
+        idx = self.next()
+        return url, {'name': f'Замер {idx}', 'slug': f'benchmark-{idx}'}
+
+    def new_reference(self, model):
+        idx = self.next()
+        return model.objects.create(
+            name=f'Замер {idx}', slug=f'benchmark-{idx}'
+        ).slug
+
+    def title_data(self):
+        return {
+            'name': self.name(),
+            'year': 2000,
+            'genre': [self.genre_slug],
+            'category': self.category_slug,
+        }
+
+    def batch_ids(self):
+        return ','.join(map(str, self.title_ids[:100]))
+
+    def new_title(self):
+        return Title.objects.create(name=self.name(), year=2000).pk
+
+    def free_title(self):
+        title_id = self.title_ids[self.next() % len(self.title_ids)]
+        Review.objects.filter(title_id=title_id, author=self.user).delete()
+        return title_id
+
+    def new_review(self):
+        title_id = self.free_title()
+        review = Review.objects.create(
+            title_id=title_id, author=self.user, text=self.name(), score=5
+        )
+        return f'{TITLES}{title_id}/reviews/{review.pk}/'
+
+    def new_comment(self):
+        comment = Comment.objects.create(
+            review_id=self.review_id, author=self.user, text=self.name()
+        )
+        return COMMENTS.format(ctx=self) + f'{comment.pk}/'
+
+    def user_data(self):
+        idx = self.next()
+        return {
+            'username': f'benchmark{idx}',
+            'email': f'benchmark{idx}@yamdb.fake',
+        }
+
+    def new_user(self):
+        return User.objects.create(**self.user_data()).username
+
+
+class EndpointBenchmark:
+
+    def __init__(self, iterations=50, warmup=5, use_cache=True,
+                 endpoints=ENDPOINTS):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.use_cache = use_cache
+        self.endpoints = endpoints
+        self.context = BenchmarkContext()
+        self.clients = {
+            'anonymous': APIClient(),
+            'user': self.make_client(self.context.user),
+            'admin': self.make_client(self.context.admin),
+        }
+
+    def make_client(self, user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+        return client
+
+    def request(self, endpoint):
+        url, data = endpoint.prepare(self.context)
+        if not self.use_cache:
+            cache.clear()
+        client = self.clients[endpoint.role]
+        queries = QueryTimer()
+        with connection.execute_wrapper(queries):
+            started = time.perf_counter()
+            response = getattr(client, endpoint.method)(
+                url, data=data, format='json'
+            )
+            if response.streaming:
+                content = b''.join(response.streaming_content)
+            else:
+                content = response.content
+            elapsed = time.perf_counter() - started
+        return Sample(
+            url,
+            response.status_code,
+            elapsed * 1000,
+            queries.count,
+            queries.seconds * 1000,
+            len(content),
+        )
+
+    def measure(self, endpoint):
+        iterations = min(
+            self.iterations, endpoint.max_iterations or self.iterations
+        )
+        for _ in range(self.warmup):
+            self.request(endpoint)
+        samples = [self.request(endpoint) for _ in range(iterations)]
+        timings = [sample.ms for sample in samples]
+        queries = [sample.queries for sample in samples]
+        p50, p95, p99 = percentiles(timings)
+        return {
+            'route': endpoint.route,
+            'method': endpoint.method.upper(),
+            'role': endpoint.role,
+            'url': samples[-1].url,
+            'status': samples[-1].status,
+            'errors': sum(sample.status >= 400 for sample in samples),
+            'requests': iterations,
+            'p50_ms': round(p50, 3),
+            'p95_ms': round(p95, 3),
+            'p99_ms': round(p99, 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'queries': statistics.median(queries),
+            'queries_max': max(queries),
+            'sql_ms': round(statistics.mean(
+                sample.sql_ms for sample in samples
+            ), 3),
+            'bytes': round(statistics.mean(
+                sample.bytes for sample in samples
+            )),
+        }
+
+    def run(self, progress=None):
+        results = {}
+        for endpoint in self.endpoints:
+            results[endpoint.name] = self.measure(endpoint)
+            if progress is not None:
+                progress(endpoint.name, results[endpoint.name])
+        return results
+
+
+def compare_results(baseline, current, max_regression=None):
+    rows = []
+    for name, result in current.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        change = (
+            (result['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100
+            if old['p95_ms'] else 0
+        )
+        regressed = result['queries'] > old['queries'] or (
+            max_regression is not None and change > max_regression
+        )
+        rows.append({
+            'name': name,
+            'p95_ms': (old['p95_ms'], result['p95_ms']),
+            'p95_change': round(change, 1),
+            'queries': (old['queries'], result['queries']),
+            'bytes': (old['bytes'], result['bytes']),
+            'regressed': regressed,
+        })
+    return rows
@@ -0,0 +1,78 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import urlencode
+
+VERSION_KEY = 'api:version:{}'
+MODIFIED_KEY = 'api:modified:{}'
+
+
+def version_key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def modified_key(model):
+    return MODIFIED_KEY.format(model._meta.label_lower)
+
+
+def new_version():
+    return time.time_ns()
+
+
+def get_versions(models):
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    key = version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, new_version(), None)
+    cache.set(modified_key(model), time.time(), None)
+
+
+def get_last_modified(models):
+    keys = [modified_key(model) for model in models]
+    modified = cache.get_many(keys)
+    if len(modified) < len(keys):
+        return None
+    return max(modified.values())
+
+
+def get_role(user):
+    if not user.is_authenticated:
+        return 'anonymous'
+    if user.is_admin():
+        return settings.ADMIN
+    return user.role
+
+
+def response_fingerprint(request, models, *extra):
+    params = urlencode(sorted(request.query_params.lists()), doseq=True)
+    parts = (
+        request.path,
+        params,
+        get_role(request.user),
+        *map(str, get_versions(models)),
+        *extra,
+    )
+    return hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+
+def response_cache_key(request, models):
+    return f'api:response:{response_fingerprint(request, models)}'
+
+
+def response_etag(request, models):
+    return '"{}"'.format(response_fingerprint(
+        request, models, request.accepted_renderer.format
+    ))
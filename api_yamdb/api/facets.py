@@ -0,0 +1,101 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils.http import urlencode
+from rest_framework.exceptions import ValidationError
+
+from reviews.models import Category, Genre, Title
+from .cache import get_versions
+from .metrics import CACHE_REQUESTS
+from .reference import categories, genres
+
+FACETS_KEY = 'api:facets:{}'
+FACET_MODELS = (Title, Genre, Category)
+
+
+def reference_counts(reference, rows):
+    by_id = reference.get().by_id
+    counts = [
+        {
+            'slug': by_id[pk].slug,
+            'name': by_id[pk].name,
+            'count': count,
+        }
+        for pk, count in rows if pk in by_id
+    ]
+    return sorted(counts, key=lambda item: (-item['count'], item['slug']))
+
+
+def category_facet(queryset):
+    return reference_counts(
+        categories,
+        queryset.order_by().values_list('category').annotate(
+            count=Count('pk')
+        )
+    )
+
+
+def genre_facet(queryset):
+    return reference_counts(
+        genres,
+        Title.genre.through.objects.filter(
+            title__in=queryset.order_by().values('pk')
+        ).values_list('genre').annotate(count=Count('pk')).order_by()
+    )
+
+
+def year_facet(queryset):
+    return [
+        {'year': year, 'count': count}
+        for year, count in queryset.order_by().values_list('year').annotate(
+            count=Count('pk')
+        ).order_by('year')
+    ]
+
+
+FACETS = {
+    'category': category_facet,
+    'genre': genre_facet,
+    'year': year_facet,
+}
+
+
+def parse_facets(value):
+    names = list(dict.fromkeys(
+        name.strip() for name in value.split(',') if name.strip()
+    ))
+    unknown = [name for name in names if name not in FACETS]
+    if unknown:
+        raise ValidationError({'facets': [
+            f'Неизвестный фасет: {name}. Доступны: {", ".join(FACETS)}.'
+            for name in unknown
+        ]})
+    return names
+
+
+def facet_cache_key(name, params, versions):
+    selection = urlencode(sorted(params.items()), doseq=True)
+    return FACETS_KEY.format(hashlib.md5(
+        f'{name}|{selection}|{versions}'.encode()
+    ).hexdigest())
+
+
+def get_facets(queryset, names, params):
+    versions = '|'.join(map(str, get_versions(FACET_MODELS)))
+    keys = {name: facet_cache_key(name, params, versions) for name in names}
+    cached = cache.get_many(keys.values())
+    facets = {}
+    missing = {}
+    for name, key in keys.items():
+        CACHE_REQUESTS.inc(
+            cache='facets', result='hit' if key in cached else 'miss'
+        )
+        if key in cached:
+            facets[name] = cached[key]
+        else:
+            facets[name] = missing[key] = FACETS[name](queryset)
+    if missing:
+        cache.set_many(missing, settings.API_CACHE_TIMEOUT)
+    return facets
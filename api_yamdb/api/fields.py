@@ -0,0 +1,72 @@
+from django.utils.encoding import smart_str
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class ManySlugRelatedField(serializers.ManyRelatedField):
+    default_error_messages = {
+        'does_not_exist': 'Не найдены объекты с {slug_name}: {values}.',
+        'invalid': 'Некорректное значение.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        if not all(isinstance(value, str) for value in data):
+            self.fail('invalid')
+        slugs = list(dict.fromkeys(data))
+        slug_field = self.child_relation.slug_field
+        objects = self.child_relation.get_objects(slugs)
+        missing = [slug for slug in slugs if slug not in objects]
+        if missing:
+            self.fail(
+                'does_not_exist',
+                slug_name=slug_field,
+                values=', '.join(missing)
+            )
+        return [objects[slug] for slug in slugs]
+
+
+class BulkSlugRelatedField(serializers.SlugRelatedField):
+
+    def get_objects(self, slugs):
+        return {
+            getattr(obj, self.slug_field): obj
+            for obj in self.get_queryset().filter(
+                **{f'{self.slug_field}__in': slugs}
+            )
+        }
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManySlugRelatedField(**list_kwargs)
+
+
+class ReferenceSlugRelatedField(BulkSlugRelatedField):
+
+    def __init__(self, reference, **kwargs):
+        self.reference = reference
+        kwargs.setdefault('queryset', reference.model.objects.all())
+        super().__init__(slug_field='slug', **kwargs)
+
+    def get_objects(self, slugs):
+        by_slug = self.reference.get().by_slug
+        return {slug: by_slug[slug] for slug in slugs if slug in by_slug}
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.get_objects([data]).get(data)
+        if obj is None:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data)
+            )
+        return obj
@@ -1,13 +1,74 @@
 import django_filters
+from django.db.models import Count
 
 from reviews.models import Title
+from reviews.search import to_match_query
+from .reference import categories, genres
+
+REFERENCES = {'category': categories, 'genre': genres}
+MATCH_ANY = 'any'
+MATCH_ALL = 'all'
+MATCH_CHOICES = ((MATCH_ANY, MATCH_ANY), (MATCH_ALL, MATCH_ALL))
+
+
+def search(queryset, query):
+    query = to_match_query(query)
+    if not query:
+        return queryset.none()
+    return queryset.filter(
+        search__document__match=query
+    ).order_by('search__rank')
+
+
+class SlugInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    pass
 
 
 class TitleFilter(django_filters.FilterSet):
     name = django_filters.CharFilter()
-    category = django_filters.CharFilter(lookup_expr='slug')
-    genre = django_filters.CharFilter(lookup_expr='slug')
+    category = SlugInFilter(method='filter_category')
+    genre = SlugInFilter(method='filter_genre')
+    genre_match = django_filters.ChoiceFilter(
+        choices=MATCH_CHOICES, method='filter_genre_match'
+    )
+    year_min = django_filters.NumberFilter(
+        field_name='year', lookup_expr='gte'
+    )
+    year_max = django_filters.NumberFilter(
+        field_name='year', lookup_expr='lte'
+    )
+    q = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ['genre', 'category', 'name', 'year']
+
+    def reference_ids(self, name, slugs):
+        by_slug = REFERENCES[name].get().by_slug
+        return {by_slug[slug].pk for slug in slugs if slug in by_slug}
+
+    def filter_category(self, queryset, name, value):
+        ids = self.reference_ids(name, value)
+        if not ids:
+            return queryset.none()
+        return queryset.filter(category__in=ids)
+
+    def filter_genre(self, queryset, name, value):
+        ids = self.reference_ids(name, value)
+        match_all = self.form.cleaned_data.get('genre_match') == MATCH_ALL
+        if not ids or match_all and len(ids) < len(set(value)):
+            return queryset.none()
+        titles = Title.genre.through.objects.filter(
+            genre__in=ids
+        ).values('title')
+        if match_all and len(ids) > 1:
+            titles = titles.annotate(
+                matched=Count('genre')
+            ).filter(matched=len(ids)).values('title')
+        return queryset.filter(pk__in=titles)
+
+    def filter_genre_match(self, queryset, name, value):
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return search(queryset, value)
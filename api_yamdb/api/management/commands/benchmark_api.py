@@ -0,0 +1,152 @@
+import json
+import platform
+from io import StringIO
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+from django.utils import timezone
+
+from api.benchmark import (ENDPOINTS, EndpointBenchmark, compare_results,
+                           uncovered_routes)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет задержку, число SQL-запросов и размер ответов всех '
+        'эндпоинтов API на синтетических данных во временной базе данных'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=10_000,
+            help='Количество отзывов в синтетических данных'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Количество замеряемых запросов к каждому эндпоинту'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Количество запросов для прогрева перед замерами'
+        )
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            dest='endpoints',
+            choices=[endpoint.name for endpoint in ENDPOINTS],
+            help='Замерить только указанный эндпоинт (можно повторять)'
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Очищать кеш перед каждым запросом'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default='benchmark.json',
+            help='Файл для сохранения результатов в формате JSON'
+        )
+        parser.add_argument(
+            '--compare',
+            type=str,
+            help='JSON-файл предыдущего запуска для сравнения'
+        )
+        parser.add_argument(
+            '--max-regression',
+            type=float,
+            help='Допустимый рост p95 в процентах при сравнении'
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('Количество замеров должно быть больше нуля.')
+        selected = options['endpoints']
+        endpoints = [
+            endpoint for endpoint in ENDPOINTS
+            if not selected or endpoint.name in selected
+        ]
+        for route in uncovered_routes():
+            self.stdout.write(self.style.WARNING(
+                f'Маршрут без замеров: {route}'))
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            call_command(
+                'generate_data', reviews=options['reviews'],
+                seed=options['seed'], stdout=StringIO()
+            )
+            results = EndpointBenchmark(
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                use_cache=not options['no_cache'],
+                endpoints=endpoints,
+            ).run(progress=self.report)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        data = {
+            'meta': {
+                'created': timezone.now().isoformat(),
+                'reviews': options['reviews'],
+                'seed': options['seed'],
+                'iterations': options['iterations'],
+                'warmup': options['warmup'],
+                'cache': not options['no_cache'],
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'endpoints': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты сохранены в {options["output"]}'))
+        if options['compare']:
+            self.compare(
+                options['compare'], results, options['max_regression']
+            )
+
+    def report(self, name, result):
+        style = self.style.ERROR if result['errors'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f'{name:<24} p50 {result["p50_ms"]:8.2f} мс  '
+            f'p95 {result["p95_ms"]:8.2f} мс  '
+            f'p99 {result["p99_ms"]:8.2f} мс  '
+            f'запросов {result["queries"]:>4g}  '
+            f'SQL {result["sql_ms"]:7.2f} мс  {result["bytes"]} Б'
+        ))
+
+    def compare(self, path, results, max_regression):
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)['endpoints']
+        rows = compare_results(baseline, results, max_regression)
+        for row in rows:
+            style = self.style.ERROR if row['regressed'] else str
+            self.stdout.write(style(
+                f'{row["name"]:<24} '
+                f'p95 {row["p95_ms"][0]:8.2f} -> {row["p95_ms"][1]:8.2f} мс '
+                f'({row["p95_change"]:+.1f}%)  '
+                f'запросов {row["queries"][0]} -> {row["queries"][1]}  '
+                f'{row["bytes"][0]} -> {row["bytes"][1]} Б'
+            ))
+        regressed = [row['name'] for row in rows if row['regressed']]
+        if regressed:
+            raise CommandError(
+                f'Регрессия производительности: {", ".join(regressed)}'
+            )
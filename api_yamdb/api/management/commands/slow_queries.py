@@ -0,0 +1,72 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.slow_queries import aggregate, read_entries
+
+ORDERING = {
+    'total': 'total_ms',
+    'count': 'count',
+    'max': 'max_ms',
+    'mean': 'mean_ms',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Группирует записи журнала медленных SQL-запросов по '
+        'нормализованному тексту запроса'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log',
+            type=str,
+            default=settings.SLOW_QUERY_LOG,
+            help='Журнал медленных запросов (архивные части читаются тоже)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Количество выводимых групп запросов'
+        )
+        parser.add_argument(
+            '--order-by',
+            choices=ORDERING,
+            default='total',
+            help='Сортировка групп запросов'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Вывести результат в формате JSON'
+        )
+
+    def handle(self, *args, **options):
+        groups = sorted(
+            aggregate(read_entries(options['log'])),
+            key=lambda group: group[ORDERING[options['order_by']]],
+            reverse=True,
+        )[:options['limit']]
+        if options['json']:
+            self.stdout.write(json.dumps(groups, ensure_ascii=False, indent=2))
+            return
+        if not groups:
+            self.stdout.write('Медленных запросов не найдено.')
+            return
+        for group in groups:
+            self.stdout.write(self.style.WARNING(
+                f'{group["fingerprint"]}  запросов {group["count"]:>5}  '
+                f'всего {group["total_ms"]:10.2f} мс  '
+                f'среднее {group["mean_ms"]:8.2f} мс  '
+                f'макс. {group["max_ms"]:8.2f} мс'
+            ))
+            self.stdout.write(f'  {group["sql"]}')
+            views = ', '.join(
+                f'{view} ({count})' for view, count in group['views'].items()
+            )
+            self.stdout.write(f'  Представления: {views}')
+            for line in group['plan'] or ():
+                self.stdout.write(f'  План: {line}')
@@ -0,0 +1,323 @@
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+ARCHIVE_FILE = 'archive.json'
+ARCHIVE_LOCK = 'archive.lock'
+ARCHIVED_TYPES = ('counter', 'histogram')
+
+logger = logging.getLogger('api.metrics')
+
+
+def escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace(
+        '"', r'\"'
+    )
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        f'{name}="{escape(value)}"' for name, value in pairs
+    ) + '}'
+
+
+class Metric:
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def merge(self, values, other):
+        for key, value in other:
+            key = tuple(key)
+            values[key] = values.get(key, 0) + value
+
+    def samples(self, values):
+        for key, value in sorted(values.items()):
+            yield (
+                f'{self.name}{format_labels(self.labelnames, key)} '
+                f'{format_value(value)}'
+            )
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames, buckets):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+        with self.registry.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 2)
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[idx] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def merge(self, values, other):
+        for key, state in other:
+            key = tuple(key)
+            current = values.setdefault(key, [0] * len(state))
+            for idx, value in enumerate(state):
+                current[idx] += value
+
+    def samples(self, values):
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), state):
+                cumulative += count
+                labels = format_labels(
+                    self.labelnames, key, (('le', format_value(bound)),)
+                )
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = format_labels(self.labelnames, key)
+            yield f'{self.name}_sum{labels} {format_value(state[-1])}'
+            yield f'{self.name}_count{labels} {cumulative}'
+
+
+def worker_alive(path):
+    try:
+        pid = int(os.path.basename(path).split('_')[1])
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (ValueError, IndexError, OSError):
+        pass
+    return True
+
+
+def read_snapshot(path):
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(path, snapshot):
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump(snapshot, file)
+    os.replace(temporary, path)
+
+
+@contextmanager
+def archive_lock():
+    with open(
+        os.path.join(settings.METRICS_DIR, ARCHIVE_LOCK), 'a'
+    ) as file:
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class Registry:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self.reset)
+
+    def reset(self):
+        self.lock = threading.Lock()
+        self.token = uuid.uuid4().hex
+        self.flushed = 0
+        for metric in self.metrics.values():
+            metric.values = {}
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(),
+                  buckets=DURATION_BUCKETS):
+        return self.register(
+            Histogram(self, name, documentation, labelnames, buckets)
+        )
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def dump(self):
+        with self.lock:
+            return {
+                name: [
+                    [list(key), list(value) if isinstance(value, list)
+                     else value]
+                    for key, value in metric.values.items()
+                ]
+                for name, metric in self.metrics.items()
+            }
+
+    def path(self):
+        return os.path.join(
+            settings.METRICS_DIR, f'metrics_{os.getpid()}_{self.token}.json'
+        )
+
+    def flush(self):
+        self.flushed = time.monotonic()
+        path = self.path()
+        try:
+            os.makedirs(settings.METRICS_DIR, exist_ok=True)
+            write_snapshot(path, self.dump())
+        except OSError:
+            logger.warning('Не удалось записать метрики в %s', path,
+                           exc_info=True)
+
+    def maybe_flush(self):
+        if settings.METRICS_DIR and (
+            time.monotonic() - self.flushed
+            >= settings.METRICS_FLUSH_INTERVAL
+        ):
+            self.flush()
+
+    def snapshots(self):
+        if not settings.METRICS_DIR:
+            return [self.dump()]
+        self.flush()
+        own = self.path()
+        snapshots = [self.dump()]
+        for path in glob.glob(
+            os.path.join(settings.METRICS_DIR, 'metrics_*.json')
+        ):
+            if path == own:
+                continue
+            if not worker_alive(path):
+                self.archive(path)
+                continue
+            snapshot = read_snapshot(path)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        archive = read_snapshot(
+            os.path.join(settings.METRICS_DIR, ARCHIVE_FILE)
+        )
+        if archive is not None:
+            snapshots.append(archive)
+        return snapshots
+
+    def archive(self, path):
+        archive_path = os.path.join(settings.METRICS_DIR, ARCHIVE_FILE)
+        try:
+            with archive_lock():
+                snapshot = read_snapshot(path)
+                if snapshot is None:
+                    return
+                archive = read_snapshot(archive_path) or {}
+                for name, values in snapshot.items():
+                    metric = self.metrics.get(name)
+                    if metric is None or metric.type not in ARCHIVED_TYPES:
+                        continue
+                    merged = {}
+                    metric.merge(merged, archive.get(name, []))
+                    metric.merge(merged, values)
+                    archive[name] = [
+                        [list(key), value]
+                        for key, value in merged.items()
+                    ]
+                write_snapshot(archive_path, archive)
+                os.remove(path)
+        except OSError:
+            logger.warning('Не удалось архивировать метрики из %s', path,
+                           exc_info=True)
+
+    def collect(self):
+        merged = {name: {} for name in self.metrics}
+        for snapshot in self.snapshots():
+            for name, values in snapshot.items():
+                if name in self.metrics:
+                    self.metrics[name].merge(merged[name], values)
+        return merged
+
+    def expose(self):
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {escape(metric.documentation)}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            lines.extend(metric.samples(values))
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+REQUESTS = REGISTRY.counter(
+    'yamdb_http_requests_total',
+    'Количество HTTP-запросов',
+    ('view', 'action', 'method', 'status'),
+)
+REQUEST_DURATION = REGISTRY.histogram(
+    'yamdb_http_request_duration_seconds',
+    'Время обработки HTTP-запроса',
+    ('view', 'action'),
+)
+DB_QUERIES = REGISTRY.histogram(
+    'yamdb_db_queries_per_request',
+    'Количество SQL-запросов на HTTP-запрос',
+    ('view', 'action'),
+    buckets=QUERY_BUCKETS,
+)
+DB_DURATION = REGISTRY.histogram(
+    'yamdb_db_duration_seconds',
+    'Время выполнения SQL-запросов на HTTP-запрос',
+    ('view', 'action'),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    'yamdb_cache_requests_total',
+    'Обращения к кешам API по результату',
+    ('cache', 'result'),
+)
@@ -0,0 +1,212 @@
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import (DB_DURATION, DB_QUERIES, REGISTRY, REQUEST_DURATION,
+                      REQUESTS)
+from .profiling import (ProfileRateThrottle, RequestProfiler, get_admin,
+                        hot_functions, profile_lock, profile_requested,
+                        server_timing)
+from .slow_queries import SlowQueryLogger
+from .timing import QueryTimer, RequestTimings, current_timings
+
+logger = logging.getLogger('api.timing')
+
+
+def install_timer(timer):
+    wrappers = [
+        connection.execute_wrappers for connection in connections.all()
+    ]
+    for execute_wrappers in wrappers:
+        execute_wrappers.append(timer)
+    return wrappers
+
+
+def remove_timer(wrappers, timer):
+    for execute_wrappers in wrappers:
+        if timer in execute_wrappers:
+            execute_wrappers.remove(timer)
+
+
+def on_stream_end(response, callback):
+    content = response.streaming_content
+
+    def stream():
+        size = 0
+        try:
+            for chunk in content:
+                size += len(chunk)
+                yield chunk
+        finally:
+            callback(size)
+
+    response.streaming_content = stream()
+
+
+class MetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        wrappers = install_timer(timer)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        except Exception:
+            remove_timer(wrappers, timer)
+            raise
+
+        def finish(size=None):
+            remove_timer(wrappers, timer)
+            self.record(
+                request, response, time.perf_counter() - started, timer
+            )
+
+        if response.streaming:
+            on_stream_end(response, finish)
+        else:
+            finish()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        method = request.method.lower()
+        actions = getattr(view_func, 'actions', None) or {}
+        request.metrics_action = actions.get(method, method)
+
+    def record(self, request, response, elapsed, timer):
+        match = request.resolver_match
+        labels = {
+            'view': match.view_name if match else 'unmatched',
+            'action': getattr(
+                request, 'metrics_action', request.method.lower()
+            ),
+        }
+        REQUESTS.inc(
+            method=request.method, status=response.status_code, **labels
+        )
+        REQUEST_DURATION.observe(elapsed, **labels)
+        DB_QUERIES.observe(timer.count, **labels)
+        DB_DURATION.observe(timer.seconds, **labels)
+        REGISTRY.maybe_flush()
+
+
+class ServerTimingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return self.get_response(request)
+        timings = RequestTimings()
+        wrappers = install_timer(timings.queries)
+        token = current_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        except Exception:
+            self.finish(request, None, timings, wrappers, None)
+            raise
+        finally:
+            current_timings.reset(token)
+        if response.streaming:
+            on_stream_end(
+                response,
+                lambda size: self.finish(
+                    request, response, timings, wrappers, size
+                )
+            )
+        else:
+            self.finish(
+                request, response, timings, wrappers, len(response.content)
+            )
+        response['Server-Timing'] = timings.header()
+        return response
+
+    def finish(self, request, response, timings, wrappers, size):
+        timings.finish()
+        remove_timer(wrappers, timings.queries)
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code if response is not None else 500,
+            **timings.as_dict(),
+            'bytes': size,
+        }))
+
+
+class SlowQueryMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = settings.SLOW_QUERY_THRESHOLD_MS
+
+    def __call__(self, request):
+        if self.threshold < 0:
+            return self.get_response(request)
+        timer = SlowQueryLogger(
+            self.threshold / 1000, lambda: self.source(request)
+        )
+        wrappers = install_timer(timer)
+        try:
+            response = self.get_response(request)
+        except Exception:
+            remove_timer(wrappers, timer)
+            raise
+        if response.streaming:
+            on_stream_end(response, lambda size: remove_timer(wrappers, timer))
+        else:
+            remove_timer(wrappers, timer)
+        return response
+
+    def source(self, request):
+        match = request.resolver_match
+        return {
+            'view': match.view_name if match else None,
+            'action': getattr(request, 'metrics_action', None),
+            'method': request.method,
+            'path': request.path,
+        }
+
+
+class ProfilingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profile_requested(request):
+            return self.get_response(request)
+        request.profile_user = get_admin(request)
+        if request.profile_user is None:
+            return self.get_response(request)
+        throttle = ProfileRateThrottle()
+        if not throttle.allow_request(request, None):
+            return self.skip(request, 'throttled')
+        if not profile_lock.acquire(blocking=False):
+            return self.skip(request, 'busy')
+        try:
+            with RequestProfiler() as profiler:
+                response = self.get_response(request)
+        finally:
+            profile_lock.release()
+        response['X-Profile'] = 'ok'
+        response['X-Profile-Top'] = server_timing(
+            hot_functions(profiler.stats(), settings.PROFILING_TOP)
+        )
+        if settings.PROFILING_DIR:
+            response['X-Profile-File'] = profiler.save(request)
+        return response
+
+    def skip(self, request, status):
+        response = self.get_response(request)
+        response['X-Profile'] = status
+        return response
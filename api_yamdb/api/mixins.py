@@ -1,7 +1,17 @@
-from rest_framework import filters, mixins, viewsets
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from django.utils.http import http_date
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.response import Response
 
+from .cache import get_last_modified, response_cache_key, response_etag
+from .metrics import CACHE_REQUESTS
 from .permissions import AdminOrReadOnly
 
+CONDITIONAL_HEADERS = {'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE'}
+
 
 class ListCreateDestroyViewSet(
     mixins.ListModelMixin,
@@ -12,6 +22,113 @@ class ListCreateDestroyViewSet(
     pass
 
 
+class CursorPaginationMixin:
+    cursor_pagination_class = None
+    pagination_mode_param = 'pagination'
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return self.cursor_pagination_class is not None and (
+            params.get(self.pagination_mode_param) == 'cursor'
+            or self.cursor_pagination_class.cursor_query_param in params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.use_cursor_pagination():
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
+class ConditionalGetMixin:
+    cache_models = ()
+
+    def get_response(self, handler, request, *args, **kwargs):
+        return handler(request, *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag = response_etag(request, self.cache_models)
+        last_modified = get_last_modified(self.cache_models)
+        if last_modified is not None:
+            last_modified = int(last_modified)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if CONDITIONAL_HEADERS & request.META.keys():
+            CACHE_REQUESTS.inc(
+                cache='conditional',
+                result='miss' if response is None else 'hit'
+            )
+        if response is None:
+            response = self.get_response(handler, request, *args, **kwargs)
+        if response.status_code not in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(
+            response,
+            no_cache=True,
+            public=not request.user.is_authenticated,
+            private=request.user.is_authenticated,
+        )
+        patch_vary_headers(response, ('Accept', 'Authorization'))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class VersionedCacheMixin(ConditionalGetMixin):
+
+    def get_response(self, handler, request, *args, **kwargs):
+        key = response_cache_key(request, self.cache_models)
+        data = cache.get(key)
+        CACHE_REQUESTS.inc(
+            cache='response', result='miss' if data is None else 'hit'
+        )
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        return response
+
+
+class ReferenceListMixin:
+    reference = None
+
+    def filter_rows(self, rows):
+        terms = [
+            term.casefold()
+            for term in filters.SearchFilter().get_search_terms(self.request)
+        ]
+        fields = [field.lstrip('^=@$') for field in self.search_fields]
+        return [
+            row for row in rows
+            if all(
+                any(
+                    term in str(getattr(row, field)).casefold()
+                    for field in fields
+                )
+                for term in terms
+            )
+        ]
+
+    def list(self, request, *args, **kwargs):
+        rows = self.filter_rows(self.reference.get().rows)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(rows, many=True)
+        return Response(serializer.data)
+
+
 class SearchFilterMixin:
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
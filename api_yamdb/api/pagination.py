@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ReviewCursorPagination(CursorPagination):
+    ordering = ('-pub_date', '-id')
+
+
+class CommentCursorPagination(CursorPagination):
+    ordering = ('id',)
@@ -0,0 +1,109 @@
+import cProfile
+import os
+import pstats
+import re
+import threading
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.throttling import SimpleRateThrottle
+
+from users.authentication import RoleClaimsJWTAuthentication
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+UNSAFE = re.compile(r'[^\w-]+')
+
+profile_lock = threading.Lock()
+
+
+class ProfileRateThrottle(SimpleRateThrottle):
+    scope = 'profile'
+
+    def get_rate(self):
+        return settings.PROFILING_RATE
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope, 'ident': request.profile_user.pk
+        }
+
+
+def profile_requested(request):
+    return bool(
+        request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+    )
+
+
+def get_admin(request):
+    try:
+        result = RoleClaimsJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if result is None or not result[0].is_admin():
+        return None
+    return result[0]
+
+
+def format_location(filename, line, function):
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base):
+        filename = os.path.relpath(filename, base)
+    elif os.sep in filename:
+        filename = os.path.join(*filename.split(os.sep)[-2:])
+    return f'{filename}:{line}({function})'
+
+
+def hot_functions(stats, limit):
+    rows = sorted(
+        stats.stats.items(), key=lambda item: item[1][2], reverse=True
+    )
+    return [
+        {
+            'function': format_location(*key),
+            'calls': calls,
+            'self_ms': round(own * 1000, 2),
+            'cumulative_ms': round(cumulative * 1000, 2),
+        }
+        for key, (_, calls, own, cumulative, _) in rows[:limit]
+    ]
+
+
+def server_timing(functions):
+    return ', '.join(
+        f'hot{idx};dur={row["self_ms"]:.2f};'
+        f'desc="{row["function"]} x{row["calls"]}"'
+        for idx, row in enumerate(functions, 1)
+    )
+
+
+def profile_filename(request):
+    path = UNSAFE.sub('_', request.path).strip('_') or 'root'
+    return (
+        f'{timezone.now():%Y%m%dT%H%M%S}_{request.method.lower()}_{path}_'
+        f'{uuid.uuid4().hex[:8]}.prof'
+    )
+
+
+class RequestProfiler:
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+
+    def stats(self):
+        return pstats.Stats(self.profile)
+
+    def save(self, request):
+        name = profile_filename(request)
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        self.profile.dump_stats(os.path.join(settings.PROFILING_DIR, name))
+        return name
@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from reviews.models import Category, Genre
+from .cache import get_versions
+from .metrics import CACHE_REQUESTS
+
+Snapshot = namedtuple(
+    'Snapshot', ('version', 'loaded_at', 'rows', 'by_id', 'by_slug')
+)
+EMPTY = Snapshot(None, None, (), {}, {})
+
+
+class ReferenceCache:
+
+    def __init__(self, model):
+        self.model = model
+        self.lock = threading.Lock()
+        self.snapshot = EMPTY
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def is_stale(self, snapshot, version):
+        return snapshot.version != version or (
+            time.monotonic() - snapshot.loaded_at
+            >= settings.REFERENCE_CACHE_TIMEOUT
+        )
+
+    def get(self):
+        [version] = get_versions([self.model])
+        result = 'hit'
+        if self.is_stale(self.snapshot, version):
+            with self.lock:
+                if self.is_stale(self.snapshot, version):
+                    self.snapshot = self.load(version)
+                    result = 'miss'
+        CACHE_REQUESTS.inc(
+            cache=f'reference.{self.model._meta.model_name}', result=result
+        )
+        return self.snapshot
+
+    def load(self, version):
+        rows = tuple(self.model.objects.order_by('id'))
+        return Snapshot(
+            version,
+            time.monotonic(),
+            rows,
+            {row.pk: row for row in rows},
+            {row.slug: row for row in rows},
+        )
+
+    def clear(self):
+        with self.lock:
+            self.snapshot = EMPTY
+
+
+categories = ReferenceCache(Category)
+genres = ReferenceCache(Genre)
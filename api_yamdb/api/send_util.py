@@ -1,11 +1,34 @@
-from django.conf import settings
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from users.models import OutboxEmail
+from users.outbox import unclaimed
+
+
+def requeue_pending(email, content, now):
+    return OutboxEmail.objects.filter(
+        unclaimed(now), email=email, sent_at__isnull=True
+    ).update(attempts=0, next_attempt_at=now, last_error='', **content)
 
 
 def send_confirmation_code(confirmation_code, email):
-    send_mail(
-        subject='Код подтверждения',
-        message=f'Твой код подтверждения: {confirmation_code}',
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[email]
-    )
+    content = {
+        'subject': 'Код подтверждения',
+        'message': f'Твой код подтверждения: {confirmation_code}',
+    }
+    now = timezone.now()
+    if requeue_pending(email, content, now):
+        return
+    try:
+        with transaction.atomic():
+            OutboxEmail.objects.create(
+                email=email, next_attempt_at=now, **content
+            )
+    except IntegrityError:
+        # Either a concurrent signup queued the email first, or the pending
+        # email is claimed by a sender: then only its content is refreshed,
+        # so the code is not delivered twice.
+        if not requeue_pending(email, content, now):
+            OutboxEmail.objects.filter(
+                email=email, sent_at__isnull=True
+            ).update(**content)
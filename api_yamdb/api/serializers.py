@@ -1,10 +1,21 @@
+from django.db import (IntegrityError, NotSupportedError, connection,
+                       transaction)
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
 from rest_framework.relations import SlugRelatedField
 
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import add_score
+from .cache import bump_version
+from .timing import TimedSerializerMixin
+from .fields import ReferenceSlugRelatedField
+from .reference import categories, genres
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin,
+                       serializers.ModelSerializer):
     author = SlugRelatedField(slug_field='username', read_only=True)
 
     class Meta:
@@ -12,18 +23,29 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         read_only_fields = ('title',)
 
-    def validate(self, data):
-        request = self.context["request"]
-        title_id = self.context["view"].kwargs.get("title_id")
-        if (
-            Review.objects.filter(title=title_id, author=request.user).exists()
-            and request.method == "POST"
-        ):
-            raise serializers.ValidationError("Entry already exists.")
-        return data
-
-
-class CommentSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        review = Review(**validated_data)
+        review._score_added = True
+        try:
+            with transaction.atomic():
+                if not add_score(review.title_id, review.score):
+                    raise NotFound
+                review.save()
+        except IntegrityError:
+            if Review.objects.filter(
+                title_id=review.title_id, author=review.author
+            ).exists():
+                raise serializers.ValidationError({
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        'Entry already exists.'
+                    ]
+                })
+            raise
+        return review
+
+
+class CommentSerializer(TimedSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
@@ -34,7 +56,8 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ('review',)
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin,
+                         serializers.ModelSerializer):
 
     class Meta:
         model = Category
@@ -45,7 +68,8 @@ class CategorySerializer(serializers.ModelSerializer):
         }
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin,
+                      serializers.ModelSerializer):
 
     class Meta:
         model = Genre
@@ -56,20 +80,103 @@ class GenreSerializer(serializers.ModelSerializer):
         }
 
 
-class TitleSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
-        slug_field='slug', many=True, queryset=Genre.objects.all()
-    )
-    category = serializers.SlugRelatedField(
-        slug_field='slug', queryset=Category.objects.all()
-    )
+def assign_inserted_pks(objects):
+    if connection.features.can_return_rows_from_bulk_insert:
+        return
+    if connection.vendor != 'sqlite' or not connection.in_atomic_block:
+        raise NotSupportedError(
+            'Идентификаторы созданных произведений можно прочитать только '
+            'в транзакции SQLite или через RETURNING.'
+        )
+    # Without RETURNING the ids are read back: the open transaction holds
+    # the SQLite write lock, so the newest rows are the ones just inserted.
+    pks = Title.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    )[:len(objects)]
+    for obj, pk in zip(objects, reversed(pks)):
+        obj.pk = pk
+
+
+class TitleListSerializer(serializers.ListSerializer):
+
+    @transaction.atomic
+    def create(self, validated_data):
+        titles = [
+            Title(**{
+                field: value for field, value in item.items()
+                if field != 'genre'
+            })
+            for item in validated_data
+        ]
+        Title.objects.bulk_create(titles)
+        assign_inserted_pks(titles)
+        Title.bulk_set_genres({
+            title: item['genre']
+            for title, item in zip(titles, validated_data)
+        }, created=True)
+        transaction.on_commit(lambda: bump_version(Title))
+        prefetch_related_objects(titles, 'genre')
+        return titles
+
+    @transaction.atomic
+    def update(self, instances, validated_data):
+        groups = {}
+        genres_by_title = {}
+        for title, item in zip(instances, validated_data):
+            item = dict(item)
+            if 'genre' in item:
+                genres_by_title[title] = item.pop('genre')
+            for field, value in item.items():
+                setattr(title, field, value)
+            if item:
+                groups.setdefault(tuple(sorted(item)), []).append(
+                    (title, item)
+                )
+        for fields, members in groups.items():
+            values = members[0][1]
+            if all(item == values for _, item in members):
+                Title.objects.filter(
+                    pk__in=[title.pk for title, _ in members]
+                ).update(**values)
+            else:
+                Title.objects.bulk_update(
+                    [title for title, _ in members], fields
+                )
+        if genres_by_title:
+            Title.bulk_set_genres(genres_by_title)
+        transaction.on_commit(lambda: bump_version(Title))
+        prefetch_related_objects(instances, 'genre')
+        return instances
+
+
+class TitleSerializer(TimedSerializerMixin,
+                      serializers.ModelSerializer):
+    genre = ReferenceSlugRelatedField(genres, many=True)
+    category = ReferenceSlugRelatedField(categories)
 
     class Meta:
         model = Title
-        fields = '__all__'
-
-
-class ReadTitleSerializer(serializers.ModelSerializer):
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+        list_serializer_class = TitleListSerializer
+
+    @transaction.atomic
+    def create(self, validated_data):
+        genres = validated_data.pop('genre')
+        title = super().create(validated_data)
+        title.set_genres(genres, created=True)
+        return title
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        genres = validated_data.pop('genre', None)
+        instance = super().update(instance, validated_data)
+        if genres is not None:
+            instance.set_genres(genres)
+        return instance
+
+
+class ReadTitleSerializer(TimedSerializerMixin,
+                          serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True)
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
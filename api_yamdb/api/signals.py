@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from .cache import bump_version
+
+
+def invalidate_model(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(sender))
+
+
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(lambda: bump_version(Title))
+
+
+for model in (Category, Genre, Title, Review, Comment, User):
+    post_save.connect(invalidate_model, sender=model)
+    post_delete.connect(invalidate_model, sender=model)
+m2m_changed.connect(invalidate_title_genres, sender=Title.genre.through)
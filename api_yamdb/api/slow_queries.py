@@ -0,0 +1,174 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.db import DatabaseError, NotSupportedError
+from django.utils import timezone
+
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDERS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+SPACE = re.compile(r'\s+')
+EXPLAINABLE = ('select', 'with')
+
+logger = logging.getLogger('api.slow_queries')
+handler_lock = threading.Lock()
+
+
+def normalize(sql):
+    sql = STRING.sub('?', sql).replace('%s', '?')
+    sql = NUMBER.sub('?', sql)
+    sql = PLACEHOLDERS.sub('(...)', sql)
+    return SPACE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def value_shape(params):
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return [type(value).__name__ for value in params or ()]
+
+
+def params_shape(params, many):
+    if not many:
+        return value_shape(params)
+    if not isinstance(params, (list, tuple)):
+        return {'rows': None}
+    return {
+        'rows': len(params),
+        'row': value_shape(params[0]) if params else [],
+    }
+
+
+def explain(connection, sql, params):
+    try:
+        prefix = connection.ops.explain_query_prefix()
+        cursor = connection.create_cursor()
+        try:
+            cursor.execute(f'{prefix} {sql}', params)
+            return [str(row[-1]) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except (DatabaseError, NotSupportedError):
+        return None
+
+
+def get_logger():
+    path = os.path.abspath(settings.SLOW_QUERY_LOG)
+    with handler_lock:
+        if not any(
+            getattr(handler, 'baseFilename', None) == path
+            for handler in logger.handlers
+        ):
+            for handler in logger.handlers[:]:
+                logger.removeHandler(handler)
+                handler.close()
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                encoding='utf-8',
+                delay=True,
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+    return logger
+
+
+class SlowQueryLogger:
+
+    def __init__(self, threshold=None, source=dict):
+        if threshold is None:
+            threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+        self.threshold = threshold
+        self.source = source
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed = time.perf_counter() - started
+        if elapsed >= self.threshold:
+            self.record(context['connection'], sql, params, many, elapsed)
+        return result
+
+    def record(self, connection, sql, params, many, elapsed):
+        normalized = normalize(sql)
+        plan = None
+        if not many and normalized.lower().startswith(EXPLAINABLE):
+            plan = explain(connection, sql, params)
+        get_logger().info(json.dumps({
+            'time': timezone.now().isoformat(),
+            'duration_ms': round(elapsed * 1000, 2),
+            'fingerprint': fingerprint(normalized),
+            'sql': normalized,
+            'params': params_shape(params, many),
+            **self.source(),
+            'plan': plan,
+        }, ensure_ascii=False))
+
+
+def log_files(path):
+    backups = [
+        name for name in glob.glob(f'{glob.escape(path)}.*')
+        if name.rsplit('.', 1)[-1].isdigit()
+    ]
+    return [
+        *sorted(
+            backups,
+            key=lambda name: int(name.rsplit('.', 1)[-1]),
+            reverse=True,
+        ),
+        path,
+    ]
+
+
+def read_entries(path):
+    for name in log_files(path):
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def aggregate(entries):
+    groups = {}
+    for entry in entries:
+        group = groups.get(entry['fingerprint'])
+        if group is None:
+            group = groups[entry['fingerprint']] = {
+                'fingerprint': entry['fingerprint'],
+                'sql': entry['sql'],
+                'count': 0,
+                'total_ms': 0,
+                'max_ms': 0,
+                'views': Counter(),
+                'plan': None,
+            }
+        group['count'] += 1
+        group['total_ms'] += entry['duration_ms']
+        group['max_ms'] = max(group['max_ms'], entry['duration_ms'])
+        group['views'][entry.get('view') or '-'] += 1
+        group['plan'] = entry.get('plan') or group['plan']
+    for group in groups.values():
+        group['total_ms'] = round(group['total_ms'], 2)
+        group['mean_ms'] = round(group['total_ms'] / group['count'], 2)
+        group['views'] = dict(group['views'].most_common())
+    return sorted(
+        groups.values(), key=lambda group: group['total_ms'], reverse=True
+    )
@@ -0,0 +1,123 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework.fields import empty
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class QueryTimer:
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestTimings:
+    phases = ('auth', 'ser', 'render')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.queries = QueryTimer()
+        self.seconds = {}
+        self.active = set()
+
+    def add(self, phase, seconds):
+        self.seconds[phase] = self.seconds.get(phase, 0) + seconds
+
+    @contextmanager
+    def measure(self, phase):
+        if phase in self.active:
+            yield
+            return
+        self.active.add(phase)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.active.discard(phase)
+            self.add(phase, time.perf_counter() - started)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def total(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def header(self):
+        metrics = [
+            f'db;dur={self.queries.seconds * 1000:.2f};'
+            f'desc="SQL ({self.queries.count})"'
+        ]
+        for phase in self.phases:
+            if phase in self.seconds:
+                metrics.append(
+                    f'{phase};dur={self.seconds[phase] * 1000:.2f}'
+                )
+        metrics.append(f'total;dur={self.total * 1000:.2f}')
+        return ', '.join(metrics)
+
+    def as_dict(self):
+        data = {
+            'total_ms': round(self.total * 1000, 2),
+            'db_ms': round(self.queries.seconds * 1000, 2),
+            'queries': self.queries.count,
+        }
+        for phase in self.phases:
+            data[f'{phase}_ms'] = round(self.seconds.get(phase, 0) * 1000, 2)
+        return data
+
+
+@contextmanager
+def measure(phase):
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    with timings.measure(phase):
+        yield
+
+
+class TimedViewMixin:
+
+    def initial(self, request, *args, **kwargs):
+        with measure('auth'):
+            super().initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        timings = current_timings.get()
+        if timings is not None and hasattr(
+            response, 'add_post_render_callback'
+        ):
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda response: timings.add(
+                    'render', time.perf_counter() - started
+                )
+            )
+        return response
+
+
+class TimedSerializerMixin:
+
+    def to_representation(self, instance):
+        with measure('ser'):
+            return super().to_representation(instance)
+
+    def run_validation(self, data=empty):
+        with measure('ser'):
+            return super().run_validation(data)
@@ -3,9 +3,13 @@ from rest_framework import routers
 
 from .views import (
     CategoryViewSet,
+    CommentExportAPIView,
     CommentViewSet,
     GenreViewSet,
+    ReviewExportAPIView,
     ReviewViewSet,
+    SearchAPIView,
+    TitleExportAPIView,
     TitleViewSet,
     UserViewSet,
 )
@@ -41,6 +45,18 @@ router_v1.register(
     basename='title')
 router_v1.register(r'users', UserViewSet, basename='users')
 
+export_urls_v1 = [
+    path('titles/', TitleExportAPIView.as_view(), name='export_titles'),
+    path('reviews/', ReviewExportAPIView.as_view(), name='export_reviews'),
+    path(
+        'comments/',
+        CommentExportAPIView.as_view(),
+        name='export_comments'
+    ),
+]
+
 urlpatterns = [
+    path('export/', include(export_urls_v1)),
+    path('search/', SearchAPIView.as_view(), name='search'),
     path('', include(router_v1.urls)),
 ]
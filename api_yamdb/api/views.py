@@ -1,11 +1,16 @@
+from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Avg
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, viewsets, status
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import (IsAuthenticated)
+from rest_framework.permissions import AllowAny, IsAuthenticated
 
 from reviews.models import Category, Comment, Genre, Review, Title, User
 from .permissions import (IsAdminOrModeratorOrOwnerOrReadOnly,
@@ -19,12 +24,26 @@ from .serializers import (
     TitleSerializer,
     ReadTitleSerializer
 )
-from .mixins import ListCreateDestroyViewSet, SearchFilterMixin
-from .filters import TitleFilter
+from .mixins import (ConditionalGetMixin, CursorPaginationMixin,
+                     ListCreateDestroyViewSet, ReferenceListMixin,
+                     SearchFilterMixin, VersionedCacheMixin)
+from .timing import TimedViewMixin
+from .pagination import CommentCursorPagination, ReviewCursorPagination
+from .facets import get_facets, parse_facets
+from .filters import TitleFilter, search
+from .metrics import CONTENT_TYPE, REGISTRY
+from .reference import categories, genres
+from users.authentication import get_full_user
 from users.serializers import UsersSerializer, UsersMeSerializer
 
+MAX_ID = 2 ** 63 - 1
 
-class UserViewSet(viewsets.ModelViewSet):
+
+def is_valid_id(pk):
+    return type(pk) is int and 1 <= pk <= MAX_ID
+
+
+class UserViewSet(TimedViewMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UsersSerializer
     http_method_names = ["get", "post", "patch", "delete"]
@@ -46,7 +65,7 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated],
     )
     def get_patch_me(self, request):
-        user = request.user
+        user = get_full_user(request.user)
         if request.method == "GET":
             serializer = UsersMeSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -58,28 +77,47 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(TimedViewMixin, ConditionalGetMixin,
+                    CursorPaginationMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = (IsAdminOrModeratorOrOwnerOrReadOnly,)
     pagination_class = PageNumberPagination
+    cursor_pagination_class = ReviewCursorPagination
+    cache_models = (Review, User)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
 
     def get_queryset(self):
         title_id = self.kwargs.get("title_id")
-        queryset = Review.objects.filter(title=title_id)
+        queryset = Review.objects.filter(
+            title=title_id
+        ).select_related('author')
+        if 'q' in self.request.query_params:
+            queryset = search(queryset, self.request.query_params['q'])
         return queryset
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
         serializer.save(
             author=self.request.user,
-            title=title)
+            title_id=int(self.kwargs['title_id']))
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(TimedViewMixin, ConditionalGetMixin,
+                     CursorPaginationMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = (IsAdminOrModeratorOrOwnerOrReadOnly,)
+    cursor_pagination_class = CommentCursorPagination
+    cache_models = (Comment, Review, User)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
 
     def get_queryset(self):
         review = get_object_or_404(
@@ -87,7 +125,7 @@ class CommentViewSet(viewsets.ModelViewSet):
             title_id=self.kwargs.get('title_id'),
             pk=self.kwargs.get('review_id')
         )
-        return review.comments.all().order_by('id')
+        return review.comments.select_related('author').order_by('id')
 
     def perform_create(self, serializer):
         review = get_object_or_404(
@@ -98,24 +136,252 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, review=review)
 
 
-class CategoryViewSet(SearchFilterMixin, ListCreateDestroyViewSet):
+class CategoryViewSet(TimedViewMixin, VersionedCacheMixin,
+                      ReferenceListMixin, SearchFilterMixin,
+                      ListCreateDestroyViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    reference = categories
+    cache_models = (Category,)
 
 
-class GenreViewSet(SearchFilterMixin, ListCreateDestroyViewSet):
+class GenreViewSet(TimedViewMixin, VersionedCacheMixin,
+                   ReferenceListMixin, SearchFilterMixin,
+                   ListCreateDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    reference = genres
+    cache_models = (Genre,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(rating=Avg("reviews__score"))
+class TitleViewSet(TimedViewMixin, VersionedCacheMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     serializer_class = TitleSerializer
     permission_classes = (AdminOrReadOnly,)
     filter_backends = [DjangoFilterBackend]
     filterset_class = TitleFilter
+    cache_models = (Title, Genre, Category, Review)
+    facets_query_param = 'facets'
+    batch_query_param = 'ids'
+    batch_max_size = 200
+    bulk_max_size = 5000
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    @action(detail=False, url_path='batch')
+    def batch(self, request):
+        return self.conditional_response(self.get_batch, request)
+
+    def get_batch(self, request):
+        ids = self.get_batch_ids()
+        titles = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in titles],
+        })
+
+    def get_batch_ids(self):
+        values = [
+            value.strip() for value in self.request.query_params.get(
+                self.batch_query_param, ''
+            ).split(',') if value.strip()
+        ]
+        if not values:
+            raise ValidationError({self.batch_query_param: [
+                'Укажите идентификаторы произведений через запятую.'
+            ]})
+        if not all(
+            value.isascii() and value.isdigit()
+            and is_valid_id(int(value)) for value in values
+        ):
+            raise ValidationError({self.batch_query_param: [
+                'Идентификаторы произведений должны быть целыми числами '
+                f'от 1 до {MAX_ID}.'
+            ]})
+        ids = list(dict.fromkeys(int(value) for value in values))
+        if len(ids) > self.batch_max_size:
+            raise ValidationError({self.batch_query_param: [
+                f'Можно запросить не больше {self.batch_max_size} '
+                f'произведений.'
+            ]})
+        return ids
+
+    @action(
+        detail=False, methods=['post'], url_path='bulk', url_name='bulk'
+    )
+    def bulk_create(self, request):
+        serializer = self.get_serializer(
+            data=self.get_bulk_items(), many=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        items = self.get_bulk_items()
+        serializer = self.get_serializer(
+            self.get_bulk_instances(items), data=items, many=True,
+            partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+    def get_bulk_items(self):
+        items = self.request.data
+        if not isinstance(items, list):
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Ожидается список произведений.'
+            ]})
+        if len(items) > self.bulk_max_size:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                f'Можно передать не больше {self.bulk_max_size} '
+                f'произведений.'
+            ]})
+        return items
+
+    def get_bulk_instances(self, items):
+        ids = [
+            item.get('id') if isinstance(item, dict) else None
+            for item in items
+        ]
+        titles = self.get_queryset().in_bulk(
+            [pk for pk in ids if is_valid_id(pk)]
+        )
+        errors = []
+        seen = set()
+        for pk in ids:
+            error = self.check_bulk_id(pk, titles, seen)
+            errors.append({'id': [error]} if error else {})
+            seen.add(pk)
+        if any(errors):
+            raise ValidationError(errors)
+        return [titles[pk] for pk in ids]
+
+    def check_bulk_id(self, pk, titles, seen):
+        if not is_valid_id(pk):
+            return (
+                'Укажите идентификатор произведения: целое число '
+                f'от 1 до {MAX_ID}.'
+            )
+        if pk not in titles:
+            return 'Произведение не найдено.'
+        if pk in seen:
+            return 'Произведение указано несколько раз.'
+        return None
+
+    def get_queryset(self):
+        if self.action in ("retrieve", "list", "batch"):
+            return super().get_queryset()
+        return Title.objects.select_related('category')
 
     def get_serializer_class(self):
-        if self.action in ("retrieve", "list"):
+        if self.action in ("retrieve", "list", "batch"):
             return ReadTitleSerializer
         return TitleSerializer
+
+    def paginate_queryset(self, queryset):
+        if self.facets_query_param in self.request.query_params:
+            self.facets = parse_facets(
+                self.request.query_params[self.facets_query_param]
+            )
+        return super().paginate_queryset(queryset)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if getattr(self, 'facets', None):
+            response.data['facets'] = get_facets(
+                self.filter_queryset(Title.objects.all()),
+                self.facets,
+                {
+                    name: values
+                    for name, values in self.request.query_params.lists()
+                    if name in self.filterset_class.base_filters
+                },
+            )
+        return response
+
+
+class ExportAPIView(TimedViewMixin, APIView):
+    permission_classes = (IsAdmin,)
+    queryset = None
+    serializer_class = None
+    chunk_size = 2000
+
+    def iterate_chunks(self):
+        queryset = self.queryset.order_by('pk')
+        last_pk = 0
+        while True:
+            chunk = list(queryset.filter(pk__gt=last_pk)[:self.chunk_size])
+            if not chunk:
+                return
+            yield chunk
+            last_pk = chunk[-1].pk
+
+    def stream(self):
+        encoder = JSONEncoder(ensure_ascii=False)
+        for chunk in self.iterate_chunks():
+            for item in self.serializer_class(chunk, many=True).data:
+                yield encoder.encode(item) + '\n'
+
+    def get(self, request):
+        return StreamingHttpResponse(
+            self.stream(), content_type='application/x-ndjson'
+        )
+
+
+class TitleExportAPIView(ExportAPIView):
+    queryset = TitleViewSet.queryset
+    serializer_class = ReadTitleSerializer
+
+
+class ReviewExportAPIView(ExportAPIView):
+    queryset = Review.objects.select_related('author')
+    serializer_class = ReviewSerializer
+
+
+class CommentExportAPIView(ExportAPIView):
+    queryset = Comment.objects.select_related('author')
+    serializer_class = CommentSerializer
+
+
+class SearchAPIView(TimedViewMixin, APIView):
+    permission_classes = (AllowAny,)
+    max_limit = 100
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit'))
+        except (TypeError, ValueError):
+            return settings.REST_FRAMEWORK['PAGE_SIZE']
+        return min(max(limit, 1), self.max_limit)
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        limit = self.get_limit()
+        titles = search(TitleViewSet.queryset, query)[:limit]
+        reviews = search(
+            Review.objects.select_related('author'), query
+        )[:limit]
+        comments = search(
+            Comment.objects.select_related('author'), query
+        )[:limit]
+        return Response({
+            'titles': ReadTitleSerializer(titles, many=True).data,
+            'reviews': ReviewSerializer(reviews, many=True).data,
+            'comments': CommentSerializer(comments, many=True).data,
+        })
+
+
+def metrics(request):
+    return HttpResponse(REGISTRY.expose(), content_type=CONTENT_TYPE)
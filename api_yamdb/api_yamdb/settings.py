@@ -28,6 +28,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.ServerTimingMiddleware',
+    'api.middleware.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -35,6 +38,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -65,6 +69,21 @@ DATABASES = {
     }
 }
 
+# LocMemCache is per process, so cache version bumps made by one worker
+# are not seen by the others. Run several workers with a shared backend
+# (Redis, Memcached); otherwise the timeouts below bound the staleness.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+API_CACHE_TIMEOUT = 60 * 15
+
+ROLE_VERSION_CACHE_TIMEOUT = 60
+
+REFERENCE_CACHE_TIMEOUT = 60
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -96,7 +115,7 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.RoleClaimsJWTAuthentication",
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -129,3 +148,60 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 DEFAULT_FROM_EMAIL = 'confirmation@ymail.ru'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+OUTBOX_BATCH_SIZE = 100
+
+OUTBOX_MAX_ATTEMPTS = 8
+
+OUTBOX_RETRY_DELAY = 30
+
+OUTBOX_MAX_RETRY_DELAY = 60 * 60
+
+OUTBOX_CLAIM_TIMEOUT = 60 * 10
+
+# Every worker writes its own metrics file here. When /metrics is read,
+# counters and histograms of exited workers on this host are folded into
+# archive.json, so totals never go down when workers are recycled.
+METRICS_DIR = os.getenv('METRICS_DIR')
+
+METRICS_FLUSH_INTERVAL = 1
+
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.getenv('SERVER_TIMING_SAMPLE_RATE', '1.0')
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'timing': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'api.timing': {
+            'handlers': ['timing'],
+            'level': os.getenv('API_TIMING_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '100'))
+
+SLOW_QUERY_LOG = os.getenv(
+    'SLOW_QUERY_LOG', os.path.join(BASE_DIR, 'slow_queries.log')
+)
+
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+SLOW_QUERY_LOG_BACKUPS = 5
+
+PROFILING_DIR = os.getenv('PROFILING_DIR')
+
+PROFILING_RATE = '10/min'
+
+PROFILING_TOP = 15
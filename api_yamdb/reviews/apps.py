@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from reviews import signals  # noqa: F401
+        from reviews.search import ensure_search_indexes
+
+        post_migrate.connect(ensure_search_indexes, sender=self)
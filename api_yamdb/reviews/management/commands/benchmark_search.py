@@ -0,0 +1,107 @@
+import random
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.search import index_statements, REBUILD_INDEX
+from reviews.synthetic import make_vocabulary, zipf_cum_weights
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает полнотекстовый поиск FTS5 с поиском LIKE на '
+        'синтетических отзывах во временной базе в памяти'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1_000_000,
+            help='Количество синтетических отзывов'
+        )
+        parser.add_argument(
+            '--words',
+            type=int,
+            default=20,
+            help='Количество слов в одном отзыве'
+        )
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=20,
+            help='Количество поисковых запросов каждого вида'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        vocabulary = make_vocabulary(rng, 20000)
+        cum_weights = zipf_cum_weights(len(vocabulary))
+        connection = sqlite3.connect(':memory:')
+
+        started = time.perf_counter()
+        connection.execute(
+            'CREATE TABLE reviews_review (id INTEGER PRIMARY KEY, text TEXT)'
+        )
+        connection.executemany(
+            'INSERT INTO reviews_review (text) VALUES (?)',
+            (
+                (' '.join(rng.choices(
+                    vocabulary, cum_weights=cum_weights, k=options['words']
+                )),)
+                for _ in range(options['rows'])
+            )
+        )
+        self.report('Загрузка отзывов', time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for statement in index_statements(
+            'reviews_review', 'reviews_review_fts', ('text',)
+        ):
+            connection.execute(statement)
+        connection.execute(REBUILD_INDEX.format(index='reviews_review_fts'))
+        self.report('Построение индекса FTS5', time.perf_counter() - started)
+
+        words = rng.sample(vocabulary[:2000], options['queries'])
+        like = self.measure(
+            connection, words,
+            'SELECT id FROM reviews_review WHERE text LIKE ? LIMIT 10',
+            lambda word: f'%{word}%'
+        )
+        fts = self.measure(
+            connection, words,
+            'SELECT rowid FROM reviews_review_fts '
+            'WHERE reviews_review_fts MATCH ? ORDER BY rank LIMIT 10',
+            lambda word: f'"{word}"'
+        )
+        like_count = self.measure(
+            connection, words,
+            'SELECT COUNT(*) FROM reviews_review WHERE text LIKE ?',
+            lambda word: f'%{word}%'
+        )
+        fts_count = self.measure(
+            connection, words,
+            'SELECT COUNT(*) FROM reviews_review_fts '
+            'WHERE reviews_review_fts MATCH ?',
+            lambda word: f'"{word}"'
+        )
+        self.stdout.write(
+            f'Строк: {options["rows"]}, запросов: {len(words)} (медиана)'
+        )
+        self.report('LIKE, первые 10 строк', like)
+        self.report('FTS5 + BM25, первые 10 строк', fts)
+        self.report('LIKE, COUNT(*)', like_count)
+        self.report('FTS5, COUNT(*)', fts_count)
+
+    def measure(self, connection, words, sql, make_param):
+        timings = []
+        for word in words:
+            started = time.perf_counter()
+            connection.execute(sql, (make_param(word),)).fetchall()
+            timings.append(time.perf_counter() - started)
+        return sorted(timings)[len(timings) // 2]
+
+    def report(self, name, seconds):
+        self.stdout.write(f'{name}: {seconds * 1000:.2f} мс')
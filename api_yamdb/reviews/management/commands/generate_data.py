@@ -0,0 +1,134 @@
+import csv
+import os
+import time
+from datetime import datetime
+
+from django.core.management.base import CommandError
+from django.db import connection
+
+from reviews.ratings import rebuild_ratings
+from reviews.search import suspended_search_indexes
+from reviews.synthetic import CATEGORIES, GENRES, SyntheticDataset
+from .load_data import Command as LoadDataCommand
+
+
+def csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat(timespec='milliseconds').replace(
+            '+00:00', 'Z'
+        )
+    return value
+
+
+class Command(LoadDataCommand):
+    help = (
+        'Генерирует воспроизводимый синтетический набор данных и '
+        'загружает его в пустую базу данных или сохраняет в CSV-файлы '
+        'формата команды load_data'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=10_000,
+            help='Количество отзывов'
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            help='Количество пользователей (по умолчанию отзывы / 20)'
+        )
+        parser.add_argument(
+            '--titles',
+            type=int,
+            help='Количество произведений (по умолчанию отзывы / 50)'
+        )
+        parser.add_argument(
+            '--categories',
+            type=int,
+            default=len(CATEGORIES),
+            help='Количество категорий'
+        )
+        parser.add_argument(
+            '--genres',
+            type=int,
+            default=len(GENRES),
+            help='Количество жанров'
+        )
+        parser.add_argument(
+            '--comments-per-review',
+            type=float,
+            default=0.5,
+            help='Среднее количество комментариев к отзыву'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Директория для CSV-файлов вместо загрузки в базу данных'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество строк в одном пакете вставки'
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        reviews = options['reviews']
+        try:
+            dataset = SyntheticDataset(
+                reviews=reviews,
+                users=options['users'] or max(reviews // 20, 100),
+                titles=options['titles'] or max(reviews // 50, 50),
+                categories=options['categories'],
+                genres=options['genres'],
+                comments_per_review=options['comments_per_review'],
+                seed=options['seed'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['output']:
+            self.write_csv(dataset, options['output'])
+        else:
+            self.load_dataset(dataset)
+
+    def write_csv(self, dataset, path):
+        os.makedirs(path, exist_ok=True)
+        for filename, method, columns in dataset.files:
+            started = time.perf_counter()
+            count = 0
+            with open(os.path.join(path, filename), 'w', encoding='utf-8',
+                      newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(columns)
+                for row in getattr(dataset, method)():
+                    writer.writerow([csv_value(row[key]) for key in columns])
+                    count += 1
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(
+                f'{filename}: {count} строк за {elapsed:.2f} с '
+                f'({count / elapsed:.0f} строк/с)'))
+
+    def load_dataset(self, dataset):
+        files = self.get_files()
+        if any(model.objects.exists() for _, model, _ in files):
+            raise CommandError(
+                'Синтетические данные загружаются только в пустую базу '
+                'данных. Используйте --output для выгрузки в CSV-файлы.'
+            )
+        methods = {filename: method for filename, method, _ in dataset.files}
+        with suspended_search_indexes(connection):
+            for filename, model, make_object in files:
+                self.load_rows(
+                    filename, getattr(dataset, methods[filename])(),
+                    model, make_object
+                )
+        started = time.perf_counter()
+        rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинги пересчитаны за {time.perf_counter() - started:.2f} с'
+        ))
+        self.bump_versions()
@@ -1,9 +1,43 @@
-import os
 import csv
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
 
+from django.core.exceptions import FieldDoesNotExist
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from api.cache import bump_version
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.ratings import rebuild_ratings
+from reviews.search import suspended_search_indexes
+
+GenreTitle = Title.genre.through
+
+
+@contextmanager
+def keep_pub_date(model):
+    try:
+        field = model._meta.get_field('pub_date')
+    except FieldDoesNotExist:
+        yield
+        return
+    auto_now_add = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = auto_now_add
+
 
-from reviews.models import Category, Review, User, Title, Genre, Comment
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
 
 
 class Command(BaseCommand):
@@ -15,120 +49,118 @@ class Command(BaseCommand):
             type=str,
             help='Путь к директории содержащей CSV-файлы'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одном пакете вставки'
+        )
 
     def handle(self, *args, **options):
         path = options['path']
+        self.batch_size = options['batch_size']
         try:
-            self.load_users(path)
-            self.load_category(path)
-            self.load_genre(path)
-            self.load_titles(path)
-            self.load_review(path)
-            self.load_comments(path)
+            with suspended_search_indexes(connection):
+                for filename, model, make_object in self.get_files():
+                    self.load_file(
+                        os.path.join(path, filename), model, make_object
+                    )
+            rebuild_ratings()
         except Exception as e:
             self.stdout.write(self.style.ERROR(
                 f"Ошибка при загрузке данных: {str(e)}"))
+        self.bump_versions()
 
-    def load_users(self, path):
-        try:
-            with open(os.path.join(path, 'users.csv'),
-                      encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    User.objects.create(
-                        username=row['username'],
-                        email=row['email'],
-                        first_name=row['first_name'],
-                        last_name=row['last_name'],
-                        bio=row['bio'],
-                        role=row['role'],
-                    )
-        except FileNotFoundError:
-            self.stdout.write(self.style.WARNING("Файл не найден"))
-        except csv.Error as e:
-            self.stdout.write(self.style.ERROR(
-                f"Ошибка при чтении файла: {str(e)}"))
+    def bump_versions(self):
+        for _, model, _ in self.get_files():
+            bump_version(model)
 
-    def load_category(self, path):
-        try:
-            with open(os.path.join(path, 'category.csv')) as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    Category.objects.create(
-                        name=row['name'],
-                        slug=row['slug'],
-                    )
-        except FileNotFoundError:
-            self.stdout.write(self.style.WARNING("Файл не найден"))
-        except csv.Error as e:
-            self.stdout.write(self.style.ERROR(
-                f"Ошибка при чтении файла: {str(e)}"))
+    def get_files(self):
+        return (
+            ('users.csv', User, self.make_user),
+            ('category.csv', Category, self.make_category),
+            ('genre.csv', Genre, self.make_genre),
+            ('titles.csv', Title, self.make_title),
+            ('genre_title.csv', GenreTitle, self.make_genre_title),
+            ('review.csv', Review, self.make_review),
+            ('comments.csv', Comment, self.make_comment),
+        )
 
-    def load_genre(self, path):
+    def load_file(self, filename, model, make_object):
         try:
-            with open(os.path.join(path, 'genre.csv')) as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    Genre.objects.create(
-                        name=row['name'],
-                        slug=row['slug'],
-                    )
+            with open(filename, encoding='utf-8') as file:
+                self.load_rows(
+                    os.path.basename(filename), csv.DictReader(file),
+                    model, make_object
+                )
         except FileNotFoundError:
-            self.stdout.write(self.style.WARNING("Файл не найден"))
+            self.stdout.write(self.style.WARNING(
+                f"Файл не найден: {filename}"))
         except csv.Error as e:
             self.stdout.write(self.style.ERROR(
                 f"Ошибка при чтении файла: {str(e)}"))
 
-    def load_titles(self, path):
-        try:
-            with open(os.path.join(path, 'titles.csv')) as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    category = Category.objects.get(
-                        name=row['category_name'])
-                    Title.objects.create(
-                        name=row['name'],
-                        year=row['year'],
-                        description=row['description'],
-                        category=category
-                    ).genre.set(row['genre_ids'].split(','))
-        except FileNotFoundError:
-            self.stdout.write(self.style.WARNING("Файл не найден"))
-        except csv.Error as e:
-            self.stdout.write(self.style.ERROR(
-                f"Ошибка при чтении файла: {str(e)}"))
+    def load_rows(self, name, rows, model, make_object):
+        started = time.perf_counter()
+        count = 0
+        with keep_pub_date(model), transaction.atomic():
+            for batch in batches(map(make_object, rows), self.batch_size):
+                model.objects.bulk_create(batch)
+                count += len(batch)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{name}: {count} строк за {elapsed:.2f} с '
+            f'({count / elapsed:.0f} строк/с)'))
+        return count
 
-    def load_review(self, path):
-        try:
-            with open(os.path.join(path, 'review.csv')) as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    Review.objects.create(
-                        title_id=row['title_id'],
-                        text=row['text'],
-                        author_id=row['author_id'],
-                        score=row['score'],
-                        pub_date=row['pub_date']
-                    )
-        except FileNotFoundError:
-            self.stdout.write(self.style.WARNING("Файл не найден"))
-        except csv.Error as e:
-            self.stdout.write(self.style.ERROR(
-                f"Ошибка при чтении файла: {str(e)}"))
+    def make_user(self, row):
+        return User(
+            id=row['id'],
+            username=row['username'],
+            email=row['email'],
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            bio=row['bio'],
+            role=row['role'],
+        )
 
-    def load_comments(self, path):
-        try:
-            with open(os.path.join(path, 'comments.csv')) as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    Comment.objects.create(
-                        author_id=row['author_id'],
-                        review_id=row['review_id'],
-                        text=row['text'],
-                        pub_date=row['pub_date']
-                    )
-        except FileNotFoundError:
-            self.stdout.write(self.style.WARNING("Файл не найден"))
-        except csv.Error as e:
-            self.stdout.write(self.style.ERROR(
-                f"Ошибка при чтении файла: {str(e)}"))
+    def make_category(self, row):
+        return Category(id=row['id'], name=row['name'], slug=row['slug'])
+
+    def make_genre(self, row):
+        return Genre(id=row['id'], name=row['name'], slug=row['slug'])
+
+    def make_title(self, row):
+        return Title(
+            id=row['id'],
+            name=row['name'],
+            year=row['year'],
+            description=row.get('description'),
+            category_id=row['category'] or None,
+        )
+
+    def make_genre_title(self, row):
+        return GenreTitle(
+            id=row['id'],
+            title_id=row['title_id'],
+            genre_id=row['genre_id'],
+        )
+
+    def make_review(self, row):
+        return Review(
+            id=row['id'],
+            title_id=row['title_id'],
+            text=row['text'],
+            author_id=row['author'],
+            score=row['score'] or None,
+            pub_date=row['pub_date'],
+        )
+
+    def make_comment(self, row):
+        return Comment(
+            id=row['id'],
+            review_id=row['review_id'],
+            text=row['text'],
+            author_id=row['author'],
+            pub_date=row['pub_date'],
+        )
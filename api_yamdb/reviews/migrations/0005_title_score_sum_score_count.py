@@ -0,0 +1,61 @@
+# Generated by Django 3.2 on 2026-10-18 18:56
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+import reviews.validators
+
+
+def fill_title_scores(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    scores = Review.objects.filter(
+        title=models.OuterRef('pk'), score__isnull=False
+    ).order_by().values('title')
+    Title.objects.update(
+        score_sum=Coalesce(
+            models.Subquery(
+                scores.annotate(total=models.Sum('score')).values('total')
+            ), 0, output_field=models.IntegerField()
+        ),
+        score_count=Coalesce(
+            models.Subquery(
+                scores.annotate(total=models.Count('pk')).values('total')
+            ), 0, output_field=models.IntegerField()
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_auto_20230622_2213'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='review',
+            options={'ordering': ['-pub_date']},
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='score',
+            field=models.IntegerField(default=None, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10, message='Оценка должна быть от 1 до 10')]),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.IntegerField(validators=[reviews.validators.validate_year], verbose_name='Дата выхода'),
+        ),
+        migrations.RunPython(fill_title_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 3.2 on 2026-10-18 19:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import reviews.search
+
+
+def create_search_indexes(apps, schema_editor):
+    reviews.search.install_search_indexes(
+        schema_editor.connection, force=True
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    reviews.search.drop_search_indexes(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentSearch',
+            fields=[
+                ('rank', models.FloatField()),
+                ('comment', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='reviews.comment')),
+                ('document', reviews.search.SearchDocumentField(db_column='reviews_comment_fts')),
+            ],
+            options={
+                'db_table': 'reviews_comment_fts',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewSearch',
+            fields=[
+                ('rank', models.FloatField()),
+                ('review', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='reviews.review')),
+                ('document', reviews.search.SearchDocumentField(db_column='reviews_review_fts')),
+            ],
+            options={
+                'db_table': 'reviews_review_fts',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='TitleSearch',
+            fields=[
+                ('rank', models.FloatField()),
+                ('title', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='reviews.title')),
+                ('document', reviews.search.SearchDocumentField(db_column='reviews_title_fts')),
+            ],
+            options={
+                'db_table': 'reviews_title_fts',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
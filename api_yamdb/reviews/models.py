@@ -1,6 +1,8 @@
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models.signals import m2m_changed
 
+from reviews.search import SearchDocumentField
 from reviews.validators import validate_year
 from users.models import User
 
@@ -66,13 +68,92 @@ class Title(models.Model):
         related_name='titles',
         null=True
     )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    score_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
+        indexes = (
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year'], name='title_year_idx'),
+        )
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in ('score_sum', 'score_count')
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def rating(self):
+        if not self.score_count:
+            return None
+        return self.score_sum / self.score_count
+
+    def set_genres(self, genres, created=False):
+        Title.bulk_set_genres({self: genres}, created=created)
+
+    @classmethod
+    def bulk_set_genres(cls, genres_by_title, created=False):
+        through = cls.genre.through
+        links = {title.pk: {} for title in genres_by_title}
+        if not created:
+            for pk, title_id, genre_id in through.objects.filter(
+                title__in=list(links)
+            ).values_list('pk', 'title_id', 'genre_id'):
+                links[title_id][genre_id] = pk
+        removed, added = {}, {}
+        for title, genres in genres_by_title.items():
+            new_ids = {genre.pk for genre in genres}
+            old_ids = set(links[title.pk])
+            if old_ids - new_ids:
+                removed[title] = old_ids - new_ids
+            if new_ids - old_ids:
+                added[title] = new_ids - old_ids
+        if removed:
+            send_genres_changed('pre_remove', removed)
+            through.objects.filter(pk__in=[
+                links[title.pk][genre_id]
+                for title, genre_ids in removed.items()
+                for genre_id in genre_ids
+            ]).delete()
+            send_genres_changed('post_remove', removed)
+        if added:
+            send_genres_changed('pre_add', added)
+            through.objects.bulk_create(
+                through(title=title, genre_id=genre_id)
+                for title, genre_ids in added.items()
+                for genre_id in genre_ids
+            )
+            send_genres_changed('post_add', added)
+
+
+def send_genres_changed(action, genre_ids_by_title):
+    for title, genre_ids in genre_ids_by_title.items():
+        m2m_changed.send(
+            sender=Title.genre.through,
+            action=action,
+            instance=title,
+            reverse=False,
+            model=Genre,
+            pk_set=genre_ids,
+            using=title._state.db,
+        )
+
 
 class Review(models.Model):
     title = models.ForeignKey(
@@ -99,8 +180,26 @@ class Review(models.Model):
     )
     pub_date = models.DateTimeField('Дата публикации', auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._loaded_title_id = self.title_id
+        self._loaded_score = self.score
+
     class Meta:
         ordering = ['-pub_date']
+        indexes = (
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx',
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -124,5 +223,63 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         'Дата публикации', auto_now_add=True, db_index=True)
 
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=['review', 'id'],
+                name='comment_review_id_idx',
+            ),
+        )
+
     def __str__(self) -> str:
         return self.text
+
+
+class SearchIndex(models.Model):
+    rank = models.FloatField()
+
+    class Meta:
+        abstract = True
+        managed = False
+
+
+class TitleSearch(SearchIndex):
+    title = models.OneToOneField(
+        Title, on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search'
+    )
+    document = SearchDocumentField(db_column='reviews_title_fts')
+
+    class Meta(SearchIndex.Meta):
+        db_table = 'reviews_title_fts'
+
+
+class ReviewSearch(SearchIndex):
+    review = models.OneToOneField(
+        Review, on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search'
+    )
+    document = SearchDocumentField(db_column='reviews_review_fts')
+
+    class Meta(SearchIndex.Meta):
+        db_table = 'reviews_review_fts'
+
+
+class CommentSearch(SearchIndex):
+    comment = models.OneToOneField(
+        Comment, on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search'
+    )
+    document = SearchDocumentField(db_column='reviews_comment_fts')
+
+    class Meta(SearchIndex.Meta):
+        db_table = 'reviews_comment_fts'
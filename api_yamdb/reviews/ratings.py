@@ -0,0 +1,38 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.models import Review, Title
+
+
+def change_score(title_id, score, sign):
+    if title_id is None or score is None:
+        return
+    Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + sign * score,
+        score_count=F('score_count') + sign
+    )
+
+
+def add_score(title_id, score):
+    return Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + (score or 0),
+        score_count=F('score_count') + int(score is not None)
+    )
+
+
+def rebuild_ratings(queryset=None):
+    if queryset is None:
+        queryset = Title.objects.all()
+    scores = Review.objects.filter(
+        title=OuterRef('pk'), score__isnull=False
+    ).order_by().values('title')
+    return queryset.update(
+        score_sum=Coalesce(
+            Subquery(scores.annotate(total=Sum('score')).values('total')),
+            0, output_field=IntegerField()
+        ),
+        score_count=Coalesce(
+            Subquery(scores.annotate(total=Count('pk')).values('total')),
+            0, output_field=IntegerField()
+        ),
+    )
@@ -0,0 +1,105 @@
+import re
+from contextlib import contextmanager
+
+from django.db import models
+
+SEARCH_INDEXES = (
+    ('reviews_title', 'reviews_title_fts', ('name', 'description')),
+    ('reviews_review', 'reviews_review_fts', ('text',)),
+    ('reviews_comment', 'reviews_comment_fts', ('text',)),
+)
+
+CREATE_INDEX = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5("
+    "{columns}, content='{table}', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+CREATE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS {index}_ai AFTER INSERT ON {table} BEGIN "
+    "INSERT INTO {index}(rowid, {columns}) VALUES (new.id, {new}); END",
+    "CREATE TRIGGER IF NOT EXISTS {index}_ad AFTER DELETE ON {table} BEGIN "
+    "INSERT INTO {index}({index}, rowid, {columns}) "
+    "VALUES ('delete', old.id, {old}); END",
+    "CREATE TRIGGER IF NOT EXISTS {index}_au AFTER UPDATE OF {columns} "
+    "ON {table} BEGIN "
+    "INSERT INTO {index}({index}, rowid, {columns}) "
+    "VALUES ('delete', old.id, {old}); "
+    "INSERT INTO {index}(rowid, {columns}) VALUES (new.id, {new}); END",
+)
+REBUILD_INDEX = "INSERT INTO {index}({index}) VALUES ('rebuild')"
+TRIGGER_SUFFIXES = ('_ai', '_ad', '_au')
+
+
+def index_statements(table, index, columns):
+    params = {
+        'table': table,
+        'index': index,
+        'columns': ', '.join(columns),
+        'new': ', '.join(f'new.{column}' for column in columns),
+        'old': ', '.join(f'old.{column}' for column in columns),
+    }
+    return [
+        statement.format(**params)
+        for statement in (CREATE_INDEX, *CREATE_TRIGGERS)
+    ]
+
+
+def install_search_indexes(connection, force=False):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+        triggers = {row[0] for row in cursor.fetchall()}
+        for table, index, columns in SEARCH_INDEXES:
+            expected = {index + suffix for suffix in TRIGGER_SUFFIXES}
+            if not force and expected <= triggers:
+                continue
+            for statement in index_statements(table, index, columns):
+                cursor.execute(statement)
+            cursor.execute(REBUILD_INDEX.format(index=index))
+
+
+def drop_search_indexes(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for _, index, _ in SEARCH_INDEXES:
+            for suffix in TRIGGER_SUFFIXES:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {index}{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {index}')
+
+
+@contextmanager
+def suspended_search_indexes(connection):
+    drop_search_indexes(connection)
+    try:
+        yield
+    finally:
+        install_search_indexes(connection, force=True)
+
+
+def ensure_search_indexes(sender, using, **kwargs):
+    from django.db import connections
+
+    install_search_indexes(connections[using])
+
+
+def to_match_query(text):
+    words = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{word}"' for word in words)
+
+
+class SearchDocumentField(models.TextField):
+    pass
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Review, Title
+from reviews.ratings import change_score, rebuild_ratings
+
+
+def _remember_state(review):
+    review._loaded_title_id = review.title_id
+    review._loaded_score = review.score
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        if not getattr(instance, '_score_added', False):
+            change_score(instance.title_id, instance.score, 1)
+    elif update_fields is not None and not (
+        {'score', 'title', 'title_id'} & set(update_fields)
+    ):
+        return
+    elif hasattr(instance, '_loaded_score'):
+        change_score(instance._loaded_title_id, instance._loaded_score, -1)
+        change_score(instance.title_id, instance.score, 1)
+    else:
+        rebuild_ratings(Title.objects.filter(pk=instance.title_id))
+    _remember_state(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    change_score(
+        getattr(instance, '_loaded_title_id', instance.title_id),
+        getattr(instance, '_loaded_score', instance.score),
+        -1
+    )
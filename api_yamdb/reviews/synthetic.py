@@ -0,0 +1,252 @@
+import random
+import string
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from itertools import accumulate
+
+from django.conf import settings
+
+CYRILLIC_LETTERS = 'абвгдежзийклмнопрстуфхцчшщыэюя'
+CATEGORIES = (
+    ('Фильм', 'movie'),
+    ('Книга', 'book'),
+    ('Музыка', 'music'),
+    ('Сериал', 'series'),
+    ('Игра', 'game'),
+    ('Спектакль', 'play'),
+)
+GENRES = (
+    ('Драма', 'drama'),
+    ('Комедия', 'comedy'),
+    ('Вестерн', 'western'),
+    ('Фэнтези', 'fantasy'),
+    ('Фантастика', 'sci-fi'),
+    ('Детектив', 'detective'),
+    ('Триллер', 'thriller'),
+    ('Сказка', 'tale'),
+    ('Гонзо', 'gonzo'),
+    ('Роман', 'roman'),
+    ('Баллада', 'ballad'),
+    ('Rock-n-roll', 'rock-n-roll'),
+    ('Классика', 'classical'),
+    ('Рок', 'rock'),
+    ('Шансон', 'chanson'),
+)
+FIRST_DATE = datetime(2010, 1, 1, tzinfo=timezone.utc)
+LAST_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FIRST_YEAR = 1900
+
+
+def zipf_cum_weights(size, exponent=1.0):
+    return list(accumulate(
+        1 / rank ** exponent for rank in range(1, size + 1)
+    ))
+
+
+def make_vocabulary(rng, size, alphabet=string.ascii_lowercase):
+    return [
+        ''.join(rng.choices(alphabet, k=rng.randint(4, 9)))
+        for _ in range(size)
+    ]
+
+
+def reference_rows(names, count, prefix, default_name):
+    for idx in range(1, count + 1):
+        if idx <= len(names):
+            name, slug = names[idx - 1]
+        else:
+            name, slug = f'{default_name} {idx}', f'{prefix}-{idx}'
+        yield {'id': idx, 'name': name, 'slug': slug}
+
+
+class SyntheticDataset:
+    files = (
+        ('users.csv', 'users',
+         ('id', 'username', 'email', 'role', 'bio', 'first_name',
+          'last_name')),
+        ('category.csv', 'categories', ('id', 'name', 'slug')),
+        ('genre.csv', 'genres', ('id', 'name', 'slug')),
+        ('titles.csv', 'titles', ('id', 'name', 'year', 'category')),
+        ('genre_title.csv', 'genre_titles', ('id', 'title_id', 'genre_id')),
+        ('review.csv', 'reviews',
+         ('id', 'title_id', 'text', 'author', 'score', 'pub_date')),
+        ('comments.csv', 'comments',
+         ('id', 'review_id', 'text', 'author', 'pub_date')),
+    )
+
+    def __init__(self, reviews, users, titles, categories, genres,
+                 comments_per_review, seed):
+        if reviews > users * titles:
+            raise ValueError(
+                'Количество отзывов не может превышать произведение '
+                'количества пользователей на количество произведений.'
+            )
+        self.review_total = reviews
+        self.user_total = users
+        self.title_total = titles
+        self.category_total = categories
+        self.genre_total = genres
+        self.comments_per_review = comments_per_review
+        self.seed = seed
+        self.user_weights = zipf_cum_weights(users, 0.8)
+        self.category_weights = zipf_cum_weights(categories)
+        self.genre_weights = zipf_cum_weights(genres)
+        self.vocabulary = make_vocabulary(
+            self.random('vocabulary'), 20000, CYRILLIC_LETTERS
+        )
+        self.word_weights = zipf_cum_weights(len(self.vocabulary))
+
+    def random(self, stream):
+        return random.Random(f'{self.seed}:{stream}')
+
+    def words(self, rng, low, high):
+        return ' '.join(rng.choices(
+            self.vocabulary, cum_weights=self.word_weights,
+            k=rng.randint(low, high)
+        )).capitalize()
+
+    def date_between(self, rng, first, last):
+        seconds = (last - first).total_seconds()
+        return first + timedelta(seconds=rng.uniform(0, seconds))
+
+    def users(self):
+        rng = self.random('users')
+        for idx in range(1, self.user_total + 1):
+            chance = rng.random()
+            if chance < 0.002:
+                role = settings.ADMIN
+            elif chance < 0.02:
+                role = settings.MODERATOR
+            else:
+                role = settings.USER
+            yield {
+                'id': idx,
+                'username': f'user{idx}',
+                'email': f'user{idx}@yamdb.fake',
+                'role': role,
+                'bio': '',
+                'first_name': '',
+                'last_name': '',
+            }
+
+    def categories(self):
+        return reference_rows(
+            CATEGORIES, self.category_total, 'category', 'Категория'
+        )
+
+    def genres(self):
+        return reference_rows(GENRES, self.genre_total, 'genre', 'Жанр')
+
+    def titles(self):
+        rng = self.random('titles')
+        for idx in range(1, self.title_total + 1):
+            year = LAST_DATE.year - int(rng.expovariate(1 / 15))
+            yield {
+                'id': idx,
+                'name': self.words(rng, 1, 4),
+                'year': max(year, FIRST_YEAR),
+                'category': rng.choices(
+                    range(1, self.category_total + 1),
+                    cum_weights=self.category_weights
+                )[0],
+            }
+
+    def genre_titles(self):
+        rng = self.random('genre_titles')
+        genre_ids = range(1, self.genre_total + 1)
+        idx = 0
+        for title_id in range(1, self.title_total + 1):
+            count = min(
+                rng.choices((1, 2, 3), weights=(6, 3, 1))[0],
+                self.genre_total
+            )
+            genres = set()
+            while len(genres) < count:
+                genres.update(rng.choices(
+                    genre_ids, cum_weights=self.genre_weights,
+                    k=count - len(genres)
+                ))
+            for genre_id in sorted(genres):
+                idx += 1
+                yield {'id': idx, 'title_id': title_id, 'genre_id': genre_id}
+
+    @cached_property
+    def review_counts(self):
+        weights = [
+            1 / rank ** 0.9 for rank in range(1, self.title_total + 1)
+        ]
+        scale = self.review_total / sum(weights)
+        counts = [
+            min(self.user_total, int(weight * scale)) for weight in weights
+        ]
+        shortfall = self.review_total - sum(counts)
+        for rank in range(self.title_total):
+            if not shortfall:
+                break
+            extra = min(self.user_total - counts[rank], shortfall)
+            counts[rank] += extra
+            shortfall -= extra
+        self.random('popularity').shuffle(counts)
+        return counts
+
+    def sample_authors(self, rng, count):
+        if count * 4 > self.user_total:
+            return rng.sample(range(1, self.user_total + 1), count)
+        authors = set()
+        while len(authors) < count:
+            authors.update(rng.choices(
+                range(1, self.user_total + 1),
+                cum_weights=self.user_weights,
+                k=count - len(authors)
+            ))
+        return list(authors)
+
+    def review_skeletons(self):
+        rng = self.random('reviews')
+        idx = 0
+        for title_id, count in enumerate(self.review_counts, start=1):
+            mean = rng.gauss(7, 1.5)
+            for author in self.sample_authors(rng, count):
+                idx += 1
+                yield (
+                    idx,
+                    title_id,
+                    author,
+                    min(10, max(1, round(rng.gauss(mean, 1.8)))),
+                    self.date_between(rng, FIRST_DATE, LAST_DATE),
+                )
+
+    def reviews(self):
+        rng = self.random('review_texts')
+        for idx, title_id, author, score, pub_date in (
+            self.review_skeletons()
+        ):
+            yield {
+                'id': idx,
+                'title_id': title_id,
+                'text': self.words(rng, 3, 25),
+                'author': author,
+                'score': score,
+                'pub_date': pub_date,
+            }
+
+    def comments(self):
+        rng = self.random('comments')
+        idx = 0
+        for review_id, _, _, _, review_date in self.review_skeletons():
+            count = int(rng.expovariate(1) * self.comments_per_review + 0.5)
+            for _ in range(count):
+                idx += 1
+                yield {
+                    'id': idx,
+                    'review_id': review_id,
+                    'text': self.words(rng, 2, 15),
+                    'author': rng.choices(
+                        range(1, self.user_total + 1),
+                        cum_weights=self.user_weights
+                    )[0],
+                    'pub_date': self.date_between(
+                        rng, review_date,
+                        min(review_date + timedelta(days=30), LAST_DATE)
+                    ),
+                }
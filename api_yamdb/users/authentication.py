@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import User
+
+ROLE_VERSION_KEY = 'users:role_version:{}'
+CLAIM_FIELDS = (
+    'role', 'is_superuser', 'is_staff', 'is_active', 'role_version'
+)
+
+
+def role_version_key(user_id):
+    return ROLE_VERSION_KEY.format(user_id)
+
+
+def get_role_version(user_id):
+    key = role_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('role_version', flat=True).first()
+        if version is not None:
+            cache.set(key, version, settings.ROLE_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def get_full_user(user):
+    if user.get_deferred_fields():
+        return User.objects.get(pk=user.pk)
+    return user
+
+
+class RoleAccessToken(AccessToken):
+
+    @classmethod
+    def for_user(cls, user):
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'Учётная запись отключена', code='user_inactive'
+            )
+        token = super().for_user(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        return token
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        if 'role_version' not in validated_token:
+            return super().get_user(validated_token)
+        if not validated_token.get('is_active'):
+            raise AuthenticationFailed(
+                'Учётная запись отключена', code='user_inactive'
+            )
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        version = get_role_version(user_id)
+        if version is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден', code='user_not_found'
+            )
+        if version != validated_token['role_version']:
+            raise AuthenticationFailed(
+                'Права пользователя изменились, получите новый токен',
+                code='role_changed'
+            )
+        claims = {
+            field: validated_token[field] for field in CLAIM_FIELDS
+        }
+        claims['id'] = user_id
+        fields = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in claims
+        ]
+        return User.from_db(
+            DEFAULT_DB_ALIAS, fields, [claims[field] for field in fields]
+        )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import deliver_outbox
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Количество писем, отправляемых за одно соединение'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь с интервалом'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками пустой очереди, в секундах'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_outbox(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Отправлено писем: {sent}, ошибок: {failed}'))
+            if not options['loop']:
+                return
+            if not sent and not failed:
+                time.sleep(options['interval'])
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 21:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Отправляется до'),
+        ),
+    ]
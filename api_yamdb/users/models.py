@@ -1,9 +1,12 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 import api_yamdb.settings as settings
 from .validators import validate_username
 
+ACCESS_FIELDS = ('role', 'is_superuser', 'is_staff', 'is_active')
+
 
 class User(AbstractUser):
     username = models.CharField(
@@ -22,6 +25,33 @@ class User(AbstractUser):
         default=settings.USER,
     )
     confirmation_code = models.TextField('Код подтверждения')
+    role_version = models.PositiveIntegerField(
+        'Версия прав доступа', default=0, editable=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_access = instance.get_access()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._loaded_access = self.get_access()
+
+    def get_access(self):
+        return tuple(
+            self.__dict__.get(field) for field in ACCESS_FIELDS
+        )
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_access', None)
+        if loaded is not None and loaded != self.get_access():
+            self.role_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'role_version'}
+        super().save(*args, **kwargs)
+        self._loaded_access = self.get_access()
 
     def is_admin(self):
         return (self.role == settings.ADMIN or self.is_superuser
@@ -35,3 +65,36 @@ class User(AbstractUser):
 
     class Meta:
         ordering = ['username']
+
+
+class OutboxEmail(models.Model):
+    email = models.EmailField('Электронная почта', max_length=254)
+    subject = models.CharField('Тема', max_length=256)
+    message = models.TextField('Текст письма')
+    attempts = models.PositiveSmallIntegerField('Попытки отправки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+    claimed_until = models.DateTimeField(
+        'Отправляется до', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        ordering = ['id']
+        indexes = (
+            models.Index(
+                fields=['sent_at', 'next_attempt_at'],
+                name='outbox_pending_idx',
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=['email'],
+                condition=models.Q(sent_at__isnull=True),
+                name='unique_pending_email',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.email}: {self.subject}'
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(
+        settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.OUTBOX_MAX_RETRY_DELAY
+    ))
+
+
+def unclaimed(now):
+    return Q(claimed_until__isnull=True) | Q(claimed_until__lte=now)
+
+
+def pending_emails(now):
+    return OutboxEmail.objects.filter(
+        unclaimed(now),
+        sent_at__isnull=True,
+        next_attempt_at__lte=now,
+        attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+    ).order_by('next_attempt_at', 'id')
+
+
+def claim_emails(batch_size):
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+    features = connections[DEFAULT_DB_ALIAS].features
+    with transaction.atomic():
+        queryset = pending_emails(now)
+        if features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        emails = list(queryset[:batch_size])
+        if not emails:
+            return []
+        claimed = pending_emails(now).filter(
+            pk__in=[email.pk for email in emails]
+        ).update(claimed_until=lease_until)
+    if claimed < len(emails):
+        claimed_ids = set(OutboxEmail.objects.filter(
+            pk__in=[email.pk for email in emails],
+            claimed_until=lease_until,
+        ).values_list('pk', flat=True))
+        emails = [email for email in emails if email.pk in claimed_ids]
+    return emails
+
+
+def mark_failed(email, now, error):
+    email.attempts += 1
+    email.next_attempt_at = now + retry_delay(email.attempts)
+    email.last_error = str(error)
+
+
+def send_emails(emails):
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        now = timezone.now()
+        for email in emails:
+            mark_failed(email, now, error)
+        return sent, len(emails)
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[email.email],
+                connection=connection,
+            )
+            now = timezone.now()
+            try:
+                message.send()
+            except Exception as error:
+                mark_failed(email, now, error)
+                failed += 1
+            else:
+                email.attempts += 1
+                email.sent_at = now
+                email.last_error = ''
+                sent += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    return sent, failed
+
+
+def deliver_outbox(batch_size=None):
+    emails = claim_emails(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not emails:
+        return 0, 0
+    sent, failed = send_emails(emails)
+    for email in emails:
+        email.claimed_until = None
+    OutboxEmail.objects.bulk_update(emails, (
+        'attempts', 'next_attempt_at', 'sent_at', 'last_error',
+        'claimed_until'
+    ))
+    return sent, failed
@@ -1,11 +1,13 @@
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from api.timing import TimedSerializerMixin
 from reviews.models import User
 from .validators import validate_username
 
 
-class RegisterUserSerializer(serializers.Serializer):
+class RegisterUserSerializer(TimedSerializerMixin,
+                             serializers.Serializer):
     email = serializers.EmailField(
         max_length=254
     )
@@ -37,7 +39,8 @@ class RegisterUserSerializer(serializers.Serializer):
         fields = ['email', 'username']
 
 
-class TokenSerializer(serializers.Serializer):
+class TokenSerializer(TimedSerializerMixin,
+                      serializers.Serializer):
     username = serializers.CharField()
     confirmation_code = serializers.CharField()
 
@@ -48,7 +51,8 @@ class TokenSerializer(serializers.Serializer):
         )
 
 
-class UsersSerializer(serializers.ModelSerializer):
+class UsersSerializer(TimedSerializerMixin,
+                      serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import role_version_key
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    key = role_version_key(instance.pk)
+    if not instance.is_active:
+        transaction.on_commit(lambda: cache.delete(key))
+        return
+    version = instance.role_version
+    transaction.on_commit(lambda: cache.set(
+        key, version, settings.ROLE_VERSION_CACHE_TIMEOUT
+    ))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    key = role_version_key(instance.pk)
+    transaction.on_commit(lambda: cache.delete(key))
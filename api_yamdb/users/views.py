@@ -1,12 +1,14 @@
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework import permissions
 from rest_framework import generics, status
 from rest_framework.response import Response
 
 from reviews.models import User
 from api.send_util import send_confirmation_code
+from api.timing import TimedViewMixin
+from .authentication import RoleAccessToken
 from .serializers import (
     RegisterUserSerializer,
     TokenSerializer,)
@@ -14,7 +16,7 @@ from .serializers import (
 codegen = PasswordResetTokenGenerator()
 
 
-class RegisterUserAPIView(generics.CreateAPIView):
+class RegisterUserAPIView(TimedViewMixin, generics.CreateAPIView):
     queryset = User.objects.all()
     permission_classes = (permissions.AllowAny,)
     serializer_class = RegisterUserSerializer
@@ -23,13 +25,16 @@ class RegisterUserAPIView(generics.CreateAPIView):
         data = request.data
         serializer = RegisterUserSerializer(data=data)
         serializer.is_valid(raise_exception=True)
-        user, _ = User.objects.get_or_create(**serializer.validated_data)
-        send_confirmation_code(user.confirmation_code,
-                               email=serializer.validated_data['email'])
+        with transaction.atomic():
+            user, _ = User.objects.get_or_create(
+                **serializer.validated_data
+            )
+            send_confirmation_code(user.confirmation_code,
+                                   email=serializer.validated_data['email'])
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class GetTokenAPIView(generics.CreateAPIView):
+class GetTokenAPIView(TimedViewMixin, generics.CreateAPIView):
     permission_classes = (permissions.AllowAny,)
 
     def post(self, request):
@@ -40,7 +45,7 @@ class GetTokenAPIView(generics.CreateAPIView):
         user = get_object_or_404(User, username=username)
 
         if confirmation_code == user.confirmation_code:
-            token = str(AccessToken.for_user(user))
+            token = str(RoleAccessToken.for_user(user))
             return Response({'token': f'{token}'}, status=status.HTTP_200_OK)
 
         return Response(
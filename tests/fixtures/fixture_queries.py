@@ -0,0 +1,38 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def query_budget():
+    def request(client, method, url, budget, data=None, name=None):
+        name = name or f'{method.upper()} {url}'
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method)(url, data=data, format='json')
+            if response.streaming:
+                response.streaming_content = [
+                    b''.join(response.streaming_content)
+                ]
+        queries = '\n'.join(
+            query['sql'] for query in context.captured_queries
+        )
+        assert len(context) <= budget, (
+            f'Эндпоинт `{name}` выполнил {len(context)} SQL-запросов при '
+            f'допустимом бюджете {budget}:\n{queries}'
+        )
+        return response, len(context)
+    return request
+
+
+@pytest.fixture
+def assert_constant_queries(query_budget):
+    def check(client, url, budget, add_objects, name=None):
+        name = name or f'GET {url}'
+        _, before = query_budget(client, 'get', url, budget, name=name)
+        add_objects()
+        _, after = query_budget(client, 'get', url, budget, name=name)
+        assert before == after, (
+            f'Число SQL-запросов эндпоинта `{name}` выросло с {before} до '
+            f'{after} при увеличении числа объектов на странице.'
+        )
+    return check
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'review', 4)
+        response = create_single_review(
+            moderator_client, title_id, 'review', 9
+        )
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что поле `rating` произведения обновляется при '
+            'создании отзыва.'
+        )
+
+        review_id = response.json()['id']
+        admin_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            data={'score': 10}
+        )
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что поле `rating` произведения обновляется при '
+            'изменении оценки в отзыве.'
+        )
+
+        admin_client.delete(f'/api/v1/titles/{title_id}/reviews/{review_id}/')
+        assert self.get_rating(admin_client, title_id) == 4, (
+            'Проверьте, что поле `rating` произведения обновляется при '
+            'удалении отзыва.'
+        )
+
+    def test_02_rating_after_author_deletion(self, admin_client, user,
+                                             user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'review', 4)
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что при удалении автора его оценки перестают '
+            'учитываться в поле `rating` произведения.'
+        )
+
+    def test_03_rebuild_ratings_command(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'review', 8)
+        Title.objects.update(score_sum=0, score_count=0)
+        call_command('rebuild_ratings')
+        assert self.get_rating(admin_client, title_id) == 8, (
+            'Проверьте, что команда `rebuild_ratings` восстанавливает '
+            'рейтинг произведений по отзывам.'
+        )
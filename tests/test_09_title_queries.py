@@ -0,0 +1,44 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+def create_titles_bulk(count):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    titles = []
+    for idx in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    @pytest.mark.parametrize('count', (1, 10))
+    def test_01_title_list_queries(self, client, django_assert_num_queries,
+                                   count):
+        create_titles_bulk(count)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == count, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/` возвращает '
+            'все произведения.'
+        )
+
+    def test_02_title_detail_queries(self, client, django_assert_num_queries):
+        title = create_titles_bulk(1)[0]
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        data = response.json()
+        assert len(data['genre']) == 3 and data['category']['slug'], (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/` '
+            'возвращает жанры и категорию произведения.'
+        )
@@ -0,0 +1,203 @@
+import pytest
+
+from api.reference import categories, genres
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from tests.utils import create_comments
+
+TITLE = '/api/v1/titles/{title_id}/'
+REVIEWS = TITLE + 'reviews/'
+REVIEW = REVIEWS + '{review_id}/'
+COMMENTS = REVIEW + 'comments/'
+COMMENT = COMMENTS + '{comment_id}/'
+BULK = '/api/v1/titles/bulk/'
+
+ENDPOINT_BUDGETS = (
+    ('category-list', 'client', 'get', '/api/v1/categories/', None, 1),
+    ('category-create', 'admin_client', 'post', '/api/v1/categories/',
+     {'name': 'Музыка', 'slug': 'music'}, 3),
+    ('category-destroy', 'admin_client', 'delete',
+     '/api/v1/categories/films/', None, 6),
+    ('genre-list', 'client', 'get', '/api/v1/genres/', None, 1),
+    ('genre-create', 'admin_client', 'post', '/api/v1/genres/',
+     {'name': 'Вестерн', 'slug': 'western'}, 3),
+    ('genre-destroy', 'admin_client', 'delete', '/api/v1/genres/horror/',
+     None, 5),
+    ('title-list', 'client', 'get', '/api/v1/titles/', None, 3),
+    ('title-list-facets', 'client', 'get',
+     '/api/v1/titles/?facets=category,genre,year', None, 6),
+    ('title-batch', 'client', 'get',
+     '/api/v1/titles/batch/?ids={title_id},9999', None, 2),
+    ('title-detail', 'client', 'get', TITLE, None, 2),
+    ('title-create', 'admin_client', 'post', '/api/v1/titles/',
+     {'name': 'Чужой', 'year': 1979, 'genre': ['horror', 'drama'],
+      'category': 'films'}, 5),
+    ('title-partial-update', 'admin_client', 'patch', TITLE,
+     {'name': 'Терминатор 2'}, 5),
+    # Bulk budgets hold while a list fits into one SQLite batch
+    # (999 variables); longer lists are split by bulk_create/bulk_update.
+    ('title-bulk-create', 'admin_client', 'post', BULK, [
+        {'name': f'Чужой {idx}', 'year': 1979, 'genre': ['horror', 'drama'],
+         'category': 'films'}
+        for idx in range(3)
+    ], 6),
+    ('title-bulk-update', 'admin_client', 'patch', BULK,
+     lambda dataset: [
+         {'id': dataset['title_id'], 'name': 'Терминатор 2',
+          'genre': ['drama']}
+     ], 8),
+    ('title-destroy', 'admin_client', 'delete', TITLE, None, 13),
+    ('review-list', 'client', 'get', REVIEWS, None, 2),
+    ('review-detail', 'client', 'get', REVIEW, None, 1),
+    ('review-create', 'user_superuser_client', 'post', REVIEWS,
+     {'text': 'Отзыв', 'score': 7}, 4),
+    ('review-partial-update', 'admin_client', 'patch', REVIEW,
+     {'text': 'Новый текст', 'score': 3}, 7),
+    ('review-destroy', 'admin_client', 'delete', REVIEW, None, 7),
+    ('comment-list', 'client', 'get', COMMENTS, None, 3),
+    ('comment-detail', 'client', 'get', COMMENT, None, 2),
+    ('comment-create', 'admin_client', 'post', COMMENTS,
+     {'text': 'Комментарий'}, 3),
+    ('comment-partial-update', 'admin_client', 'patch', COMMENT,
+     {'text': 'Новый текст'}, 5),
+    ('comment-destroy', 'admin_client', 'delete', COMMENT, None, 5),
+    ('users-list', 'admin_client', 'get', '/api/v1/users/', None, 3),
+    ('users-detail', 'admin_client', 'get', '/api/v1/users/TestUser/',
+     None, 2),
+    ('users-create', 'admin_client', 'post', '/api/v1/users/',
+     {'username': 'newbie', 'email': 'newbie@yamdb.fake'}, 4),
+    ('users-partial-update', 'admin_client', 'patch',
+     '/api/v1/users/TestUser/', {'bio': 'Новая биография'}, 3),
+    ('users-destroy', 'admin_client', 'delete', '/api/v1/users/TestUser/',
+     None, 14),
+    ('users-me', 'user_client', 'get', '/api/v1/users/me/', None, 1),
+    ('users-me-update', 'user_client', 'patch', '/api/v1/users/me/',
+     {'bio': 'Новая биография'}, 2),
+    ('export-titles', 'admin_client', 'get', '/api/v1/export/titles/',
+     None, 4),
+    ('export-reviews', 'admin_client', 'get', '/api/v1/export/reviews/',
+     None, 3),
+    ('export-comments', 'admin_client', 'get', '/api/v1/export/comments/',
+     None, 3),
+    ('search', 'client', 'get', '/api/v1/search/?q=number',
+     None, 4),
+    ('api-root', 'user_client', 'get', '/api/v1/', None, 1),
+    ('signup', 'client', 'post', '/api/v1/auth/signup/',
+     {'username': 'newbie', 'email': 'newbie@yamdb.fake'}, 12),
+    ('get-token', 'client', 'post', '/api/v1/auth/token/',
+     {'username': 'TestUser', 'confirmation_code': '12345'}, 1),
+)
+
+
+def create_authors(prefix):
+    return [
+        User.objects.create_user(
+            username=f'{prefix}{idx}', email=f'{prefix}{idx}@yamdb.fake'
+        )
+        for idx in range(3)
+    ]
+
+
+def add_categories(dataset):
+    for idx in range(3):
+        Category.objects.create(name=f'{idx}', slug=f'category-{idx}')
+    categories.get()
+
+
+def add_genres(dataset):
+    for idx in range(3):
+        Genre.objects.create(name=f'{idx}', slug=f'genre-{idx}')
+    genres.get()
+
+
+def add_titles(dataset):
+    title = Title.objects.get(pk=dataset['title_id'])
+    for idx in range(3):
+        new_title = Title.objects.create(
+            name=f'{idx}', year=2000, category=title.category
+        )
+        new_title.genre.set(title.genre.all())
+
+
+def add_reviews(dataset):
+    for author in create_authors('author'):
+        Review.objects.create(
+            title_id=dataset['title_id'], author=author, text='Отзыв',
+            score=5
+        )
+
+
+def add_comments(dataset):
+    for author in create_authors('author'):
+        Comment.objects.create(
+            review_id=dataset['review_id'], author=author,
+            text='Комментарий'
+        )
+
+
+def add_users(dataset):
+    create_authors('reader')
+
+
+LIST_ENDPOINTS = (
+    ('client', '/api/v1/categories/', 1, add_categories),
+    ('client', '/api/v1/genres/', 1, add_genres),
+    ('client', '/api/v1/titles/', 3, add_titles),
+    ('client', REVIEWS, 2, add_reviews),
+    ('client', COMMENTS, 3, add_comments),
+    ('admin_client', '/api/v1/users/', 3, add_users),
+)
+
+
+@pytest.fixture
+def dataset(admin_client, admin, user_client, user, moderator_client,
+            moderator):
+    user.confirmation_code = '12345'
+    user.save()
+    comments, reviews, titles = create_comments(admin_client, {
+        admin: admin_client,
+        user: user_client,
+        moderator: moderator_client,
+    })
+    return {
+        'title_id': titles[0]['id'],
+        'review_id': reviews[0]['id'],
+        'comment_id': comments[0]['id'],
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10QueryBudgets:
+
+    @pytest.mark.parametrize(
+        'name, client_name, method, url, data, budget',
+        ENDPOINT_BUDGETS,
+        ids=[endpoint[0] for endpoint in ENDPOINT_BUDGETS]
+    )
+    def test_01_endpoint_budget(self, request, dataset, query_budget, name,
+                                client_name, method, url, data, budget):
+        client = request.getfixturevalue(client_name)
+        if callable(data):
+            data = data(dataset)
+        response, _ = query_budget(
+            client, method, url.format(**dataset), budget, data=data,
+            name=name
+        )
+        assert response.status_code < 400, (
+            f'Эндпоинт `{name}` вернул ответ со статусом '
+            f'{response.status_code}.'
+        )
+
+    @pytest.mark.parametrize(
+        'client_name, url, budget, add_objects',
+        LIST_ENDPOINTS,
+        ids=[endpoint[1] for endpoint in LIST_ENDPOINTS]
+    )
+    def test_02_list_queries_do_not_grow(self, request, dataset,
+                                         assert_constant_queries,
+                                         client_name, url, budget,
+                                         add_objects):
+        client = request.getfixturevalue(client_name)
+        assert_constant_queries(
+            client, url.format(**dataset), budget,
+            lambda: add_objects(dataset)
+        )
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review, User
+from tests.utils import create_titles
+
+
+def create_feedback(title_id, count):
+    reviews = []
+    for idx in range(count):
+        author = User.objects.create_user(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        reviews.append(Review.objects.create(
+            title_id=title_id, author=author, text=f'Отзыв {idx}', score=5
+        ))
+        Comment.objects.create(
+            review=reviews[0], author=author, text=f'Комментарий {idx}'
+        )
+    return reviews
+
+
+def walk_pages(client, url, budget, query_budget):
+    pages, queries = [], []
+    while url:
+        response, count = query_budget(client, 'get', url, budget)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме курсорной пагинации ответ не содержит '
+            'ключ `count`.'
+        )
+        pages.append(data['results'])
+        queries.append(count)
+        url = data['next']
+    return pages, queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11CursorPagination:
+
+    def test_01_reviews_cursor(self, client, admin_client, query_budget):
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_feedback(titles[0]['id'], 25)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?pagination=cursor'
+
+        pages, queries = walk_pages(client, url, 2, query_budget)
+        received = [review['id'] for page in pages for review in page]
+        expected = [
+            review.id for review in sorted(
+                reviews, key=lambda review: (review.pub_date, review.id),
+                reverse=True
+            )
+        ]
+        assert received == expected, (
+            'Проверьте, что курсорная пагинация отзывов возвращает все '
+            'отзывы по убыванию `pub_date` без повторов и пропусков.'
+        )
+        assert len(set(queries)) == 1, (
+            'Проверьте, что получение последующих страниц отзывов в режиме '
+            'курсорной пагинации не требует дополнительных запросов к БД.'
+        )
+
+    def test_02_comments_cursor(self, client, admin_client, query_budget):
+        titles, _, _ = create_titles(admin_client)
+        review = create_feedback(titles[0]['id'], 25)[0]
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review.id}/'
+            'comments/?pagination=cursor'
+        )
+        pages, queries = walk_pages(client, url, 3, query_budget)
+        received = [comment['id'] for page in pages for comment in page]
+        assert received == sorted(
+            review.comments.values_list('id', flat=True)
+        ), (
+            'Проверьте, что курсорная пагинация комментариев возвращает '
+            'все комментарии по возрастанию `id`.'
+        )
+        assert len(set(queries)) == 1, (
+            'Проверьте, что получение последующих страниц комментариев в '
+            'режиме курсорной пагинации не требует дополнительных запросов.'
+        )
+
+    def test_03_page_number_is_default(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        create_feedback(titles[0]['id'], 3)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что без параметра `pagination=cursor` отзывы '
+            'по-прежнему пагинируются по номеру страницы.'
+        )
@@ -0,0 +1,115 @@
+import pytest
+from django.db import connection
+from rest_framework.pagination import CursorPagination
+from rest_framework.test import APIRequestFactory
+
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from reviews.models import Category, Genre, Review, Title, User
+
+REVIEW_KWARGS = ('title_id',)
+COMMENT_KWARGS = ('title_id', 'review_id')
+ENDPOINT_QUERIES = (
+    ('review-list', ReviewViewSet, {}, REVIEW_KWARGS),
+    ('review-list?pagination=cursor', ReviewViewSet,
+     {'pagination': 'cursor'}, REVIEW_KWARGS),
+    ('comment-list', CommentViewSet, {}, COMMENT_KWARGS),
+    ('comment-list?pagination=cursor', CommentViewSet,
+     {'pagination': 'cursor'}, COMMENT_KWARGS),
+    ('title-list?year', TitleViewSet, {'year': 2000}, ()),
+    ('title-list?name', TitleViewSet, {'name': 'Терминатор'}, ()),
+    ('title-list?category', TitleViewSet, {'category': 'films'}, ()),
+    ('title-list?genre', TitleViewSet, {'genre': 'horror'}, ()),
+    ('title-list?genre=any', TitleViewSet, {'genre': 'horror,drama'}, ()),
+    ('title-list?category=many', TitleViewSet,
+     {'category': 'films,books'}, ()),
+    ('title-list?year_min&year_max', TitleViewSet,
+     {'year_min': 1980, 'year_max': 1989}, ()),
+)
+
+
+def view_queryset(viewset, params, **kwargs):
+    view = viewset(
+        action='list', action_map={'get': 'list'}, args=(), kwargs=kwargs,
+        format_kwarg=None
+    )
+    view.request = view.initialize_request(
+        APIRequestFactory().get('/', params)
+    )
+    queryset = view.filter_queryset(view.get_queryset())
+    paginator = view.paginator
+    if isinstance(paginator, CursorPagination):
+        queryset = queryset.order_by(
+            *paginator.get_ordering(view.request, queryset, view)
+        )
+    return queryset
+
+
+def explain(queryset):
+    sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN есть в SQLite'
+)
+@pytest.mark.django_db
+class Test12QueryPlans:
+
+    @pytest.fixture(autouse=True)
+    def references(self):
+        films = Category.objects.create(name='Фильм', slug='films')
+        Category.objects.create(name='Книги', slug='books')
+        Genre.objects.create(name='Ужасы', slug='horror')
+        Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Терминатор', year=1984, category=films
+        )
+        author = User.objects.create_user(
+            username='author', email='author@yamdb.fake'
+        )
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=7
+        )
+        return {'title_id': title.pk, 'review_id': review.pk}
+
+    @pytest.mark.parametrize(
+        'name, viewset, params, url_kwargs',
+        ENDPOINT_QUERIES,
+        ids=[query[0] for query in ENDPOINT_QUERIES]
+    )
+    def test_01_no_full_table_scan(self, references, name, viewset, params,
+                                   url_kwargs):
+        plan = explain(view_queryset(viewset, params, **{
+            kwarg: str(references[kwarg]) for kwarg in url_kwargs
+        }))
+        scans = [
+            step for step in plan
+            if step.startswith('SCAN') and 'INDEX' not in step
+        ]
+        assert not scans, (
+            f'Основной запрос эндпоинта `{name}` выполняет полный просмотр '
+            f'таблицы: {scans}. Проверьте индексы модели.'
+        )
+        assert not any('TEMP B-TREE' in step for step in plan), (
+            f'Основной запрос эндпоинта `{name}` сортирует строки без '
+            f'индекса: {plan}.'
+        )
+
+    def test_02_all_genres_plan(self):
+        plan = explain(view_queryset(
+            TitleViewSet, {'genre': 'horror,drama', 'genre_match': 'all'}
+        ))
+        scans = [
+            step for step in plan
+            if step.startswith('SCAN') and 'INDEX' not in step
+        ]
+        assert not scans, (
+            'Фильтр по нескольким жанрам в режиме `all` выполняет полный '
+            f'просмотр таблицы: {scans}.'
+        )
+        assert any('COVERING INDEX' in step for step in plan), (
+            'Проверьте, что связи произведений и жанров читаются из '
+            f'покрывающего индекса: {plan}.'
+        )
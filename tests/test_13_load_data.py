@@ -0,0 +1,48 @@
+import os
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models import Avg
+
+from reviews.models import Comment, Review, Title
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13LoadData:
+
+    def test_01_load_data(self):
+        out = StringIO()
+        call_command('load_data', DATA_DIR, batch_size=10, stdout=out)
+        assert 'строк/с' in out.getvalue(), (
+            'Проверьте, что команда `load_data` выводит скорость загрузки '
+            'каждого файла.'
+        )
+        assert Title.objects.count() == 32
+        assert Title.genre.through.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        title = Title.objects.annotate(
+            expected=Avg('reviews__score')
+        ).get(pk=1)
+        assert title.rating == title.expected, (
+            'Проверьте, что после загрузки отзывов команда `load_data` '
+            'пересчитывает рейтинг произведений.'
+        )
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что команда `load_data` сохраняет дату публикации '
+            'из CSV-файла.'
+        )
+
+    def test_02_load_data_invalidates_cache(self, client):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        assert client.get('/api/v1/categories/').json()['count'] == 0
+        call_command('load_data', DATA_DIR, stdout=StringIO())
+        assert client.get('/api/v1/titles/').json()['count'] == 32, (
+            'Проверьте, что команда `load_data` сбрасывает кеш API для '
+            'загруженных моделей.'
+        )
+        assert client.get('/api/v1/categories/').json()['count'] > 0
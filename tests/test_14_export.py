@@ -0,0 +1,57 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+def read_lines(response):
+    content = b''.join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Export:
+
+    def test_01_export_admin_only(self, client, user_client):
+        for url in ('/api/v1/export/titles/', '/api/v1/export/reviews/',
+                    '/api/v1/export/comments/'):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+                f'Проверьте, что GET-запрос неавторизованного пользователя '
+                f'к `{url}` возвращает ответ со статусом 401.'
+            )
+            assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что GET-запрос пользователя с ролью user к '
+                f'`{url}` возвращает ответ со статусом 403.'
+            )
+
+    def test_02_export_ndjson(self, admin_client, admin, user_client, user,
+                              django_assert_max_num_queries):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        expected = (
+            ('/api/v1/export/titles/', titles, 'name'),
+            ('/api/v1/export/reviews/', reviews, 'text'),
+            ('/api/v1/export/comments/', comments, 'text'),
+        )
+        for url, objects, field in expected:
+            with django_assert_max_num_queries(4):
+                response = admin_client.get(url)
+                lines = read_lines(response)
+            assert response['Content-Type'] == 'application/x-ndjson', (
+                f'Проверьте, что `{url}` возвращает данные в формате NDJSON.'
+            )
+            assert [line[field] for line in lines] == [
+                obj[field] for obj in sorted(objects, key=lambda x: x['id'])
+            ], (
+                f'Проверьте, что `{url}` выгружает все объекты по одному '
+                'на строку.'
+            )
+        assert {'rating', 'genre', 'category'} <= set(
+            read_lines(admin_client.get('/api/v1/export/titles/'))[0]
+        ), (
+            'Проверьте, что выгрузка произведений использует те же поля, '
+            'что и `/api/v1/titles/`.'
+        )
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from api.cache import get_versions
+from reviews.models import Category, Genre, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture(params=('locmem', 'filebased'))
+def cache_backend(request, settings, tmp_path):
+    if request.param == 'filebased':
+        settings.CACHES = {
+            'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ResponseCache:
+
+    def test_01_repeated_get_hits_cache(self, cache_backend, client,
+                                        admin_client,
+                                        django_assert_num_queries):
+        create_titles(admin_client)
+        for url in ('/api/v1/titles/', '/api/v1/genres/',
+                    '/api/v1/categories/'):
+            first = client.get(url)
+            with django_assert_num_queries(0):
+                second = client.get(url)
+            assert second.json() == first.json(), (
+                f'Проверьте, что повторный GET-запрос к `{url}` возвращает '
+                'те же данные из кеша.'
+            )
+
+    def test_02_query_params_normalized(self, cache_backend, client,
+                                        admin_client,
+                                        django_assert_num_queries):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/?year=1984&category=films')
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/titles/?category=films&year=1984')
+        assert response.json()['count'] == 1
+
+    def test_03_writes_invalidate(self, cache_backend, client, admin_client,
+                                  user_client):
+        titles, _, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 8)
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что создание отзыва сбрасывает кеш произведения.'
+        )
+
+        admin_client.patch(url, data={'genre': [genres[2]['slug']]})
+        assert client.get(url).json()['genre'] == [genres[2]], (
+            'Проверьте, что изменение жанров произведения сбрасывает кеш.'
+        )
+
+        admin_client.delete(f'/api/v1/genres/{genres[2]["slug"]}/')
+        assert client.get(url).json()['genre'] == [], (
+            'Проверьте, что удаление жанра сбрасывает кеш произведений.'
+        )
+        response = client.get('/api/v1/genres/')
+        assert response.status_code == HTTPStatus.OK
+        assert genres[2] not in response.json()['results']
+
+    def test_04_role_in_cache_key(self, client, admin_client,
+                                  django_assert_num_queries):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        with django_assert_num_queries(4):
+            admin_client.get('/api/v1/titles/')
+
+    def test_05_versions_bumped_after_commit(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        models = (Category, Genre, Title)
+        before = get_versions(models)
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            Genre.objects.get(slug='drama').delete()
+            Title.objects.get(pk=titles[0]['id']).genre.clear()
+            assert get_versions(models) == before, (
+                'Проверьте, что версии кеша меняются только после фиксации '
+                'транзакции.'
+            )
+        after = get_versions(models)
+        assert all(new != old for new, old in zip(after, before))
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ConditionalGet:
+
+    def test_01_etag_not_modified(self, client, admin_client, admin,
+                                  django_assert_max_num_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            '/api/v1/genres/',
+            '/api/v1/categories/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/',
+        )
+        for url in urls:
+            response = client.get(url)
+            etag = response.get('ETag')
+            assert etag and not etag.startswith('W/'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'сильный заголовок `ETag`.'
+            )
+            assert 'public' in response['Cache-Control'], (
+                f'Проверьте, что ответ на GET-запрос анонима к `{url}` '
+                'содержит заголовок `Cache-Control: public`.'
+            )
+            with django_assert_max_num_queries(0):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                '`If-None-Match` возвращает ответ со статусом 304.'
+            )
+
+    def test_02_etag_changes_after_write(self, client, admin_client,
+                                         user_client):
+        _, titles = create_reviews(admin_client, {})
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 3)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва `ETag` произведения '
+            'меняется.'
+        )
+        assert response['ETag'] != etag
+
+    def test_03_last_modified(self, client, admin_client):
+        create_reviews(admin_client, {})
+        response = client.get('/api/v1/genres/')
+        assert response.has_header('Last-Modified'), (
+            'Проверьте, что ответ на GET-запрос к `/api/v1/genres/` '
+            'содержит заголовок `Last-Modified`.'
+        )
+        response = client.get(
+            '/api/v1/genres/',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_04_authenticated_private(self, admin_client):
+        response = admin_client.get('/api/v1/titles/')
+        assert 'private' in response['Cache-Control'], (
+            'Проверьте, что ответ авторизованному пользователю содержит '
+            'заголовок `Cache-Control: private`.'
+        )
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Search:
+
+    def test_01_title_q_filter(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?q=орешек')
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id']
+        ], (
+            'Проверьте, что параметр `q` в `/api/v1/titles/` ищет '
+            'произведения по словам из названия.'
+        )
+        response = client.get('/api/v1/titles/?q=back')
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ], (
+            'Проверьте, что параметр `q` в `/api/v1/titles/` ищет '
+            'произведения по словам из описания.'
+        )
+
+    def test_02_index_follows_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.patch(url, data={'name': 'Хищник'})
+        assert client.get('/api/v1/titles/?q=терминатор').json()[
+            'count'
+        ] == 0
+        assert client.get('/api/v1/titles/?q=хищник').json()['count'] == 1, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        admin_client.delete(url)
+        assert client.get('/api/v1/titles/?q=хищник').json()['count'] == 0, (
+            'Проверьте, что поисковый индекс обновляется при удалении '
+            'произведения.'
+        )
+
+    def test_03_search_endpoint_ranked(self, client, admin_client,
+                                       user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(
+            user_client, titles[0]['id'], 'Скучно и затянуто', 3
+        )
+        create_single_review(
+            moderator_client, titles[0]['id'],
+            'Скучно, скучно, очень скучно', 1
+        )
+        response = client.get('/api/v1/search/?q=скучно')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/search/` возвращает ответ '
+            'со статусом 200.'
+        )
+        data = response.json()
+        assert [review['score'] for review in data['reviews']] == [1, 3], (
+            'Проверьте, что `/api/v1/search/` сортирует отзывы по '
+            'релевантности.'
+        )
+        assert data['titles'] == [] and data['comments'] == []
+
+    def test_04_search_syntax_is_escaped(self, client, admin_client):
+        create_titles(admin_client)
+        for query in ('"', 'AND', '(back', '*', ''):
+            response = client.get('/api/v1/search/', {'q': query})
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что специальные символы в запросе к '
+                '`/api/v1/search/` не приводят к ошибке.'
+            )
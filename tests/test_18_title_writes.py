@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Genre
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleWrites:
+
+    def test_01_unknown_slugs_reported_together(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], 'unknown-1', 'unknown-2'],
+            'category': categories[0]['slug'],
+        }, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()['genre']
+        assert len(errors) == 1 and all(
+            slug in errors[0] for slug in ('unknown-1', 'unknown-2')
+        ), (
+            'Проверьте, что все несуществующие слаги жанров перечисляются '
+            'в одной ошибке валидации.'
+        )
+
+    def test_02_genre_slugs_resolved_in_one_query(
+        self, admin_client, django_assert_max_num_queries
+    ):
+        _, categories, _ = create_titles(admin_client)
+        slugs = [f'genre-{idx}' for idx in range(20)]
+        for slug in slugs:
+            Genre.objects.create(name=slug, slug=slug)
+        with django_assert_max_num_queries(7):
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': 'Чужой',
+                'year': 1979,
+                'genre': slugs,
+                'category': categories[0]['slug'],
+            }, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        assert sorted(response.json()['genre']) == sorted(slugs)
+
+    def test_03_genre_update_applies_diff(
+        self, admin_client, django_assert_max_num_queries
+    ):
+        titles, _, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        new_genres = [genres[1]['slug'], genres[2]['slug']]
+        with django_assert_max_num_queries(10):
+            response = admin_client.patch(
+                url, data={'genre': new_genres}, format='json'
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert sorted(response.json()['genre']) == sorted(new_genres), (
+            'Проверьте, что PATCH-запрос к `/api/v1/titles/{title_id}/` '
+            'заменяет жанры произведения.'
+        )
+
+    def test_04_write_responses_hide_internal_fields(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        public = {'id', 'name', 'year', 'description', 'genre', 'category'}
+        data = {
+            'name': 'Чужой', 'year': 1979, 'genre': ['horror'],
+            'category': 'films'
+        }
+        responses = (
+            admin_client.post('/api/v1/titles/', data=data),
+            admin_client.patch(
+                f'/api/v1/titles/{titles[0]["id"]}/', data={'year': 1985}
+            ),
+        )
+        bulk = (
+            admin_client.post(
+                '/api/v1/titles/bulk/', data=[data], format='json'
+            ),
+            admin_client.patch('/api/v1/titles/bulk/', data=[
+                {'id': titles[1]['id'], 'year': 1990}
+            ], format='json'),
+        )
+        items = [response.json() for response in responses] + [
+            response.json()[0] for response in bulk
+        ]
+        for item in items:
+            assert set(item) == public, (
+                'Проверьте, что ответы на запись произведений не содержат '
+                f'служебных полей: {sorted(set(item) - public)}.'
+            )
@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from tests.utils import create_titles
+from users.authentication import RoleAccessToken, role_version_key
+from users.models import User
+
+
+def get_client(client, user):
+    user.refresh_from_db()
+    user.confirmation_code = '12345'
+    user.save()
+    response = client.post('/api/v1/auth/token/', data={
+        'username': user.username, 'confirmation_code': '12345'
+    })
+    assert response.status_code == HTTPStatus.OK
+    claims_client = APIClient()
+    claims_client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+    )
+    return claims_client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19RoleClaims:
+
+    def test_01_permissions_without_user_query(
+        self, client, admin, admin_client, query_budget
+    ):
+        titles, _, _ = create_titles(admin_client)
+        claims_client = get_client(client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response, _ = query_budget(
+            claims_client, 'delete', url, 5, name='title-destroy'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response, _ = query_budget(
+            claims_client, 'get', '/api/v1/users/', 2, name='users-list'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что администратор с токеном, содержащим роль, '
+            'получает доступ к `/api/v1/users/` без загрузки пользователя.'
+        )
+
+    def test_02_me_loads_full_user(self, client, user):
+        response = get_client(client, user).get('/api/v1/users/me/')
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что `/api/v1/users/me/` возвращает полные данные '
+            'пользователя.'
+        )
+
+    def test_03_role_change_revokes_token(self, client, user, admin_client):
+        claims_client = get_client(client, user)
+        assert claims_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert claims_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что после изменения роли старый токен '
+            'пользователя перестаёт действовать.'
+        )
+        assert get_client(client, user).get(
+            '/api/v1/users/'
+        ).status_code == HTTPStatus.OK
+
+    def test_04_deleted_user_token_rejected(self, client, user,
+                                            admin_client):
+        claims_client = get_client(client, user)
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = claims_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_05_rolled_back_change_keeps_cache(self, client, user):
+        claims_client = get_client(client, user)
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                user.role = 'admin'
+                user.save()
+                assert cache.get(role_version_key(user.pk)) != (
+                    user.role_version
+                ), (
+                    'Проверьте, что версия роли попадает в кеш только '
+                    'после фиксации транзакции.'
+                )
+                raise RuntimeError
+        assert claims_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что отменённое изменение роли не отзывает токен.'
+
+    def test_06_inactive_user_rejected(self, client, user):
+        claims_client = get_client(client, user)
+        user.is_active = False
+        user.save()
+        for url in ('/api/v1/users/me/', '/api/v1/categories/'):
+            assert claims_client.get(url).status_code == (
+                HTTPStatus.UNAUTHORIZED
+            ), (
+                'Проверьте, что токен отключённого пользователя '
+                'перестаёт действовать.'
+            )
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': user.confirmation_code,
+        })
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что отключённый пользователь не получает токен.'
+        )
+
+    def test_07_inactive_claim_rejected(self, user):
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        user.refresh_from_db()
+        token = RoleAccessToken.for_user(User(
+            pk=user.pk, role=user.role, role_version=user.role_version
+        ))
+        token['is_active'] = False
+        claims_client = APIClient()
+        claims_client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = claims_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,156 @@
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from api import send_util
+from users.models import OutboxEmail
+from users.outbox import claim_emails, deliver_outbox
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Outbox:
+
+    def test_01_signup_does_not_send(self, client):
+        client.post(SIGNUP_URL, data={
+            'username': 'newbie', 'email': 'newbie@yamdb.fake'
+        })
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо в процессе '
+            'обработки запроса.'
+        )
+        assert OutboxEmail.objects.filter(
+            email='newbie@yamdb.fake', sent_at__isnull=True
+        ).exists(), (
+            'Проверьте, что регистрация ставит письмо в очередь.'
+        )
+
+    def test_02_repeated_signup_deduplicated(self, client):
+        data = {'username': 'newbie', 'email': 'newbie@yamdb.fake'}
+        for _ in range(3):
+            client.post(SIGNUP_URL, data=data)
+        assert OutboxEmail.objects.count() == 1, (
+            'Проверьте, что повторная регистрация с тем же адресом не '
+            'создаёт новые письма в очереди.'
+        )
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1
+        client.post(SIGNUP_URL, data=data)
+        assert OutboxEmail.objects.filter(sent_at__isnull=True).count() == 1
+
+    def test_03_batch_uses_one_connection(self, client, monkeypatch):
+        opened = []
+        original_open = EmailBackend.open
+
+        def track_open(backend):
+            opened.append(backend)
+            return original_open(backend)
+
+        monkeypatch.setattr(EmailBackend, 'open', track_open)
+        for idx in range(5):
+            client.post(SIGNUP_URL, data={
+                'username': f'newbie{idx}', 'email': f'new{idx}@yamdb.fake'
+            })
+        call_command('send_outbox')
+        assert len(mail.outbox) == 5
+        assert len(opened) == 1, (
+            'Проверьте, что письма из очереди отправляются через одно '
+            'соединение.'
+        )
+
+    def test_04_retry_with_backoff(self, client, monkeypatch):
+        def fail(backend, messages):
+            raise SMTPException('Сервер недоступен')
+
+        client.post(SIGNUP_URL, data={
+            'username': 'newbie', 'email': 'newbie@yamdb.fake'
+        })
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        call_command('send_outbox')
+        email = OutboxEmail.objects.get()
+        assert email.sent_at is None and email.attempts == 1
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что после ошибки отправки письмо откладывается.'
+        )
+        assert 'Сервер недоступен' in email.last_error
+
+        monkeypatch.undo()
+        call_command('send_outbox')
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что письмо не отправляется повторно до истечения '
+            'паузы.'
+        )
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1
+
+    def test_05_connection_failure_recorded(self, client, monkeypatch):
+        def fail(backend):
+            raise ConnectionRefusedError('Соединение отклонено')
+
+        client.post(SIGNUP_URL, data={
+            'username': 'newbie', 'email': 'newbie@yamdb.fake'
+        })
+        monkeypatch.setattr(EmailBackend, 'open', fail)
+        assert deliver_outbox() == (0, 1), (
+            'Проверьте, что ошибка соединения с почтовым сервером не '
+            'прерывает отправку очереди.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.attempts == 1 and email.sent_at is None
+        assert email.next_attempt_at > timezone.now()
+        assert 'Соединение отклонено' in email.last_error
+
+    def test_06_claimed_emails_skipped(self, client):
+        for idx in range(3):
+            client.post(SIGNUP_URL, data={
+                'username': f'newbie{idx}', 'email': f'new{idx}@yamdb.fake'
+            })
+        claimed = claim_emails(2)
+        assert len(claimed) == 2
+        assert deliver_outbox() == (1, 0), (
+            'Проверьте, что письма, взятые в отправку другим процессом, '
+            'не отправляются повторно.'
+        )
+        assert mail.outbox[0].to == [
+            OutboxEmail.objects.exclude(
+                pk__in=[email.pk for email in claimed]
+            ).get().email
+        ]
+
+    def test_07_signup_keeps_claim(self, client):
+        data = {'username': 'newbie', 'email': 'newbie@yamdb.fake'}
+        client.post(SIGNUP_URL, data=data)
+        [claimed] = claim_emails(10)
+        client.post(SIGNUP_URL, data=data)
+        email = OutboxEmail.objects.get()
+        assert email.claimed_until is not None
+        assert claim_emails(10) == [], (
+            'Проверьте, что повторная регистрация не возвращает в очередь '
+            'письмо, которое уже отправляется.'
+        )
+        assert email.next_attempt_at == claimed.next_attempt_at
+
+    def test_08_concurrent_signup(self, monkeypatch):
+        requeue_pending = send_util.requeue_pending
+        calls = []
+
+        def racing_requeue(email, content, now):
+            calls.append(email)
+            if len(calls) == 1:
+                OutboxEmail.objects.create(email=email, **content)
+                return 0
+            return requeue_pending(email, content, now)
+
+        monkeypatch.setattr(send_util, 'requeue_pending', racing_requeue)
+        send_util.send_confirmation_code('12345', 'newbie@yamdb.fake')
+        assert len(calls) == 2, (
+            'Проверьте, что при одновременной регистрации ошибка '
+            'уникальности обрабатывается повторным обновлением письма.'
+        )
+        assert OutboxEmail.objects.count() == 1
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.reference import categories
+from reviews.models import Category
+from tests.utils import create_categories, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ReferenceCache:
+
+    def test_01_lists_served_from_memory(self, admin_client, client):
+        create_categories(admin_client)
+        client.get('/api/v1/categories/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/categories/?search=фильм')
+        assert response.status_code == HTTPStatus.OK
+        assert len(context) == 0, (
+            'Проверьте, что список категорий отдаётся из кеша '
+            'справочников без обращения к базе данных.'
+        )
+        assert [item['slug'] for item in response.json()['results']] == [
+            'films'
+        ], 'Проверьте поиск по названию в кеше справочников.'
+
+    def test_02_writes_invalidate(self, admin_client, client):
+        create_categories(admin_client)
+        client.get('/api/v1/categories/')
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'}
+        )
+        response = client.get('/api/v1/categories/')
+        assert 'music' in [
+            item['slug'] for item in response.json()['results']
+        ], (
+            'Проверьте, что добавление категории сбрасывает кеш '
+            'справочников.'
+        )
+        Category.objects.filter(slug='music').delete()
+        response = client.get('/api/v1/categories/')
+        assert 'music' not in [
+            item['slug'] for item in response.json()['results']
+        ], 'Проверьте, что удаление категории сбрасывает кеш справочников.'
+
+    def test_03_title_filters_without_joins(self, admin_client, client):
+        _, categories, genres = create_titles(admin_client)
+        client.get('/api/v1/genres/')
+        for param, model, slug in (
+            ('category', 'reviews_category', categories[0]['slug']),
+            ('genre', 'reviews_genre', genres[0]['slug']),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(f'/api/v1/titles/?{param}={slug}')
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['count'] > 0
+            filter_queries = [
+                query['sql'] for query in context.captured_queries
+                if 'COUNT' in query['sql']
+            ]
+            assert filter_queries and all(
+                model not in sql for sql in filter_queries
+            ), (
+                f'Проверьте, что фильтр `{param}` списка произведений '
+                f'не соединяется с таблицей `{model}`.'
+            )
+
+    def test_04_unknown_filter_slug(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/?category=unknown')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 0
+
+    def test_05_unknown_category_rejected(self, admin_client):
+        _, _, genres = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': 'unknown',
+        }, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'category' in response.json()
+
+    def test_06_snapshot_expires(self, admin_client, settings):
+        create_categories(admin_client)
+        categories.get()
+        Category.objects.bulk_create([Category(name='Музыка', slug='music')])
+        assert 'music' not in categories.get().by_slug
+        settings.REFERENCE_CACHE_TIMEOUT = 0
+        assert 'music' in categories.get().by_slug, (
+            'Проверьте, что кеш справочников перечитывается по истечении '
+            '`REFERENCE_CACHE_TIMEOUT`, даже если версия не изменилась.'
+        )
@@ -0,0 +1,83 @@
+import filecmp
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Avg, Count
+
+from reviews.models import Comment, Genre, Review, Title, User
+
+OPTIONS = {'reviews': 600, 'users': 200, 'titles': 30, 'seed': 7}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22GenerateData:
+
+    def test_01_generate_into_database(self):
+        out = StringIO()
+        call_command('generate_data', stdout=out, **OPTIONS)
+        assert 'строк/с' in out.getvalue()
+        assert User.objects.count() == OPTIONS['users']
+        assert Title.objects.count() == OPTIONS['titles']
+        assert Review.objects.count() == OPTIONS['reviews'], (
+            'Проверьте, что команда `generate_data` создаёт заданное '
+            'количество отзывов.'
+        )
+        assert Genre.objects.exists() and Comment.objects.exists()
+        assert Title.genre.through.objects.exists()
+        title = Title.objects.annotate(
+            expected=Avg('reviews__score')
+        ).order_by('-score_count').first()
+        assert title.rating == title.expected, (
+            'Проверьте, что команда `generate_data` пересчитывает рейтинг '
+            'произведений.'
+        )
+
+    def test_02_popularity_is_skewed(self):
+        call_command('generate_data', stdout=StringIO(), **OPTIONS)
+        counts = sorted(
+            Title.objects.annotate(
+                reviews_count=Count('reviews')
+            ).values_list('reviews_count', flat=True)
+        )
+        assert counts[-1] >= 4 * counts[len(counts) // 2], (
+            'Проверьте, что популярность произведений распределена '
+            'неравномерно.'
+        )
+        authors = Counter(Review.objects.values_list('author', flat=True))
+        assert len(authors) > 1
+
+    def test_03_not_empty_database(self, admin):
+        with pytest.raises(CommandError):
+            call_command('generate_data', stdout=StringIO(), **OPTIONS)
+
+    def test_04_csv_reproducible_and_loadable(self, tmp_path):
+        for name in ('first', 'second'):
+            call_command(
+                'generate_data', output=str(tmp_path / name),
+                stdout=StringIO(), **OPTIONS
+            )
+        files = sorted(path.name for path in (tmp_path / 'first').iterdir())
+        match, mismatch, errors = filecmp.cmpfiles(
+            tmp_path / 'first', tmp_path / 'second', files, shallow=False
+        )
+        assert not mismatch and not errors, (
+            'Проверьте, что команда `generate_data` с одинаковым `--seed` '
+            'создаёт одинаковые CSV-файлы.'
+        )
+        call_command('load_data', str(tmp_path / 'first'), stdout=StringIO())
+        assert Review.objects.count() == OPTIONS['reviews'], (
+            'Проверьте, что CSV-файлы команды `generate_data` загружаются '
+            'командой `load_data`.'
+        )
+
+    def test_05_generate_invalidates_cache(self, client):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        call_command('generate_data', stdout=StringIO(), **OPTIONS)
+        assert client.get('/api/v1/titles/').json()['count'] == (
+            OPTIONS['titles']
+        ), (
+            'Проверьте, что команда `generate_data` сбрасывает кеш API для '
+            'загруженных моделей.'
+        )
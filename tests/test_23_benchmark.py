@@ -0,0 +1,62 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api.benchmark import EndpointBenchmark, compare_results, uncovered_routes
+
+RESULT_FIELDS = (
+    'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'sql_ms', 'bytes', 'status'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Benchmark:
+
+    def test_01_every_route_covered(self):
+        assert uncovered_routes() == [], (
+            'Проверьте, что набор замеров покрывает все маршруты '
+            '`api/urls.py` и `users/urls.py`.'
+        )
+
+    def test_02_run_benchmark(self):
+        call_command(
+            'generate_data', reviews=200, users=30, titles=10,
+            stdout=StringIO()
+        )
+        results = EndpointBenchmark(iterations=2, warmup=0).run()
+        failed = {
+            name: result['status'] for name, result in results.items()
+            if result['errors']
+        }
+        assert not failed, (
+            f'Эндпоинты вернули ошибки во время замеров: {failed}'
+        )
+        for name, result in results.items():
+            missing = [key for key in RESULT_FIELDS if key not in result]
+            assert not missing, (
+                f'В результатах замера `{name}` нет полей {missing}.'
+            )
+        assert results['title-create']['queries'] > 0
+        assert results['export-reviews']['bytes'] > 0
+
+    def test_03_compare_flags_query_growth(self):
+        baseline = {
+            'title-list': {'p95_ms': 10, 'queries': 3, 'bytes': 100},
+            'genre-list': {'p95_ms': 10, 'queries': 1, 'bytes': 100},
+        }
+        current = {
+            'title-list': {'p95_ms': 10, 'queries': 4, 'bytes': 100},
+            'genre-list': {'p95_ms': 13, 'queries': 1, 'bytes': 100},
+        }
+        rows = {row['name']: row for row in compare_results(
+            baseline, current, max_regression=50
+        )}
+        assert rows['title-list']['regressed'], (
+            'Проверьте, что рост числа SQL-запросов считается регрессией.'
+        )
+        assert not rows['genre-list']['regressed']
+        rows = {row['name']: row for row in compare_results(
+            baseline, current, max_regression=20
+        )}
+        assert rows['genre-list']['regressed']
@@ -0,0 +1,113 @@
+import json
+import logging
+import re
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import middleware
+from tests.utils import create_reviews
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(','):
+        name, *params = metric.strip().split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+def timing_records(caplog):
+    return [
+        json.loads(record.getMessage()) for record in caplog.records
+        if record.name == 'api.timing'
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ServerTiming:
+
+    def test_01_header_phases(self, admin_client, admin, user_client, user,
+                              moderator_client, moderator, client):
+        reviews, titles = create_reviews(admin_client, {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        })
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            )
+        assert 'Server-Timing' in response, (
+            'Проверьте, что ответы API содержат заголовок `Server-Timing`.'
+        )
+        metrics = parse_server_timing(response['Server-Timing'])
+        for phase in ('db', 'auth', 'ser', 'render', 'total'):
+            assert phase in metrics, (
+                f'Проверьте, что заголовок `Server-Timing` содержит '
+                f'метрику `{phase}`.'
+            )
+            assert float(metrics[phase]['dur']) >= 0
+        queries = int(re.search(r'\((\d+)\)', metrics['db']['desc'])[1])
+        assert queries == len(context), (
+            'Проверьте, что в заголовке `Server-Timing` указано число '
+            'SQL-запросов запроса.'
+        )
+
+    def test_02_structured_log(self, admin_client, client, caplog):
+        caplog.set_level(logging.INFO, logger='api.timing')
+        response = client.get('/api/v1/categories/')
+        records = timing_records(caplog)
+        assert records, (
+            'Проверьте, что для каждого замеренного запроса пишется '
+            'строка лога `api.timing`.'
+        )
+        record = records[-1]
+        assert record['path'] == '/api/v1/categories/'
+        assert record['status'] == response.status_code
+        assert record['bytes'] == len(response.content)
+        for key in ('total_ms', 'db_ms', 'queries', 'ser_ms', 'render_ms'):
+            assert key in record, f'В строке лога нет поля `{key}`.'
+
+    def test_03_streaming_size_logged(self, admin_client, caplog):
+        caplog.set_level(logging.INFO, logger='api.timing')
+        response = admin_client.get('/api/v1/export/titles/')
+        assert 'Server-Timing' in response
+        size = len(b''.join(response.streaming_content))
+        assert timing_records(caplog)[-1]['bytes'] == size, (
+            'Проверьте, что для потоковых ответов в лог пишется размер '
+            'отданных данных.'
+        )
+
+    def test_04_sampling(self, client, settings, caplog):
+        settings.SERVER_TIMING_SAMPLE_RATE = 0
+        caplog.set_level(logging.INFO, logger='api.timing')
+        response = client.get('/api/v1/categories/')
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что при нулевой частоте выборки заголовок '
+            '`Server-Timing` не добавляется.'
+        )
+        assert not timing_records(caplog)
+
+    def test_05_logging_configured(self, client, caplog, monkeypatch):
+        timing_logger = logging.getLogger('api.timing')
+        assert timing_logger.handlers and timing_logger.isEnabledFor(
+            logging.INFO
+        ), (
+            'Проверьте, что для логгера `api.timing` настроены обработчик '
+            'и уровень INFO в `LOGGING`.'
+        )
+        caplog.set_level(logging.WARNING, logger='api.timing')
+
+        def dumps(*args, **kwargs):
+            raise AssertionError(
+                'Проверьте, что запись для отключённого уровня логирования '
+                'не сериализуется.'
+            )
+
+        monkeypatch.setattr(middleware, 'json', SimpleNamespace(dumps=dumps))
+        response = client.get('/api/v1/categories/')
+        assert 'Server-Timing' in response
+        assert not timing_records(caplog)
@@ -0,0 +1,177 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from api.metrics import REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+
+
+def parse_metrics(text):
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Metrics:
+
+    def test_01_request_metrics(self, client):
+        client.get('/api/v1/categories/')
+        client.get('/api/v1/categories/')
+        response = client.get('/metrics')
+        assert response.status_code == 200, (
+            'Проверьте, что эндпоинт `/metrics` доступен без авторизации.'
+        )
+        assert response['Content-Type'].startswith('text/plain')
+        samples = parse_metrics(response.content.decode())
+        labels = 'view="api:category-list",action="list"'
+        assert samples.get(
+            f'yamdb_http_requests_total{{{labels},method="GET",'
+            f'status="200"}}'
+        ) == 2, (
+            'Проверьте, что счётчик запросов размечен именем маршрута, '
+            'действием, методом и статусом ответа.'
+        )
+        assert samples[
+            f'yamdb_http_request_duration_seconds_bucket{{{labels},'
+            f'le="+Inf"}}'
+        ] == 2
+        assert samples[
+            f'yamdb_http_request_duration_seconds_count{{{labels}}}'
+        ] == 2
+        assert f'yamdb_db_queries_per_request_sum{{{labels}}}' in samples, (
+            'Проверьте, что число SQL-запросов на запрос попадает в '
+            'гистограмму.'
+        )
+
+    def test_02_cache_metrics(self, admin_client, client):
+        admin_client.post('/api/v1/categories/', data={
+            'name': 'Фильмы', 'slug': 'films'
+        })
+        client.get('/api/v1/categories/')
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Поворот не туда', 'year': 2000, 'category': 'films'
+        })
+        client.get('/api/v1/categories/')
+        response = client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.get(
+            '/api/v1/titles/', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        samples = parse_metrics(client.get('/metrics').content.decode())
+        hits = 'yamdb_cache_requests_total{{cache="{}",result="hit"}}'
+        misses = 'yamdb_cache_requests_total{{cache="{}",result="miss"}}'
+        assert samples.get(misses.format('reference.category')) == 1, (
+            'Проверьте, что перезагрузка кеша справочников считается '
+            'промахом.'
+        )
+        assert samples.get(hits.format('reference.category')) >= 1, (
+            'Проверьте, что обращения к кешу справочников учитываются.'
+        )
+        assert samples.get(hits.format('conditional')) == 1, (
+            'Проверьте, что ответ 304 считается попаданием в кеш.'
+        )
+        assert samples.get(hits.format('response')) >= 1
+        assert samples.get(misses.format('response')) >= 1
+
+    def test_03_aggregates_workers(self, client, settings, tmp_path):
+        settings.METRICS_DIR = str(tmp_path)
+        client.get('/api/v1/categories/')
+        other = {
+            'yamdb_http_requests_total': [
+                [['api:category-list', 'list', 'GET', '200'], 3]
+            ],
+            'yamdb_http_request_duration_seconds': [
+                [['api:category-list', 'list'], [1] + [0] * 10 + [2, 0.5]]
+            ],
+        }
+        with open(
+            os.path.join(tmp_path, 'metrics_1_other.json'), 'w'
+        ) as file:
+            json.dump(other, file)
+        samples = parse_metrics(client.get('/metrics').content.decode())
+        labels = 'view="api:category-list",action="list"'
+        assert samples[
+            f'yamdb_http_requests_total{{{labels},method="GET",'
+            f'status="200"}}'
+        ] == 4, (
+            'Проверьте, что `/metrics` суммирует метрики всех '
+            'рабочих процессов из `METRICS_DIR`.'
+        )
+        assert samples[
+            f'yamdb_http_request_duration_seconds_count{{{labels}}}'
+        ] == 4
+        assert samples[
+            f'yamdb_http_request_duration_seconds_bucket{{{labels},'
+            f'le="0.005"}}'
+        ] >= 1
+        assert len(os.listdir(tmp_path)) == 2, (
+            'Проверьте, что каждый процесс пишет метрики в один файл.'
+        )
+
+    def test_04_missing_dir_created(self, client, settings, tmp_path):
+        settings.METRICS_DIR = str(tmp_path / 'metrics')
+        response = client.get('/api/v1/categories/')
+        assert response.status_code != 500
+        assert len(os.listdir(settings.METRICS_DIR)) == 1, (
+            'Проверьте, что каталог `METRICS_DIR` создаётся при первой '
+            'записи метрик.'
+        )
+
+    def test_05_write_errors_ignored(self, client, settings, tmp_path):
+        settings.METRICS_DIR = str(tmp_path / 'file')
+        (tmp_path / 'file').write_text('')
+        response = client.get('/api/v1/categories/')
+        assert response.status_code != 500, (
+            'Проверьте, что ошибка записи метрик не ломает запрос.'
+        )
+        samples = parse_metrics(client.get('/metrics').content.decode())
+        assert samples
+
+    def test_06_dead_workers_archived(self, client, settings, tmp_path):
+        settings.METRICS_DIR = str(tmp_path)
+        labels = 'view="api:category-list",action="list"'
+        requests = (
+            f'yamdb_http_requests_total{{{labels},method="GET",'
+            f'status="200"}}'
+        )
+        stale_files = []
+        for _ in range(2):
+            worker = subprocess.Popen([sys.executable, '-c', ''])
+            worker.wait()
+            stale = tmp_path / f'metrics_{worker.pid}_stale.json'
+            stale.write_text(json.dumps({
+                'yamdb_http_requests_total': [
+                    [['api:category-list', 'list', 'GET', '200'], 5]
+                ],
+                'yamdb_http_request_duration_seconds': [
+                    [['api:category-list', 'list'], [5] + [0] * 11 + [0.1]]
+                ],
+            }))
+            stale_files.append(stale)
+        client.get('/api/v1/categories/')
+        for _ in range(2):
+            samples = parse_metrics(client.get('/metrics').content.decode())
+            assert samples[requests] == 11, (
+                'Проверьте, что метрики завершившихся процессов сохраняются '
+                'в архиве и счётчики не уменьшаются.'
+            )
+            assert samples[
+                f'yamdb_http_request_duration_seconds_count{{{labels}}}'
+            ] == 11
+        assert not any(stale.exists() for stale in stale_files), (
+            'Проверьте, что файлы метрик завершившихся процессов удаляются '
+            'после переноса в архив.'
+        )
@@ -0,0 +1,90 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api.slow_queries import fingerprint, normalize
+from tests.utils import create_titles
+
+
+def read_log(path):
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.fixture
+def slow_log(settings, tmp_path):
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    settings.SLOW_QUERY_LOG = str(tmp_path / 'slow_queries.log')
+    return settings.SLOW_QUERY_LOG
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26SlowQueries:
+
+    def test_01_normalize(self):
+        first = normalize(
+            "SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' "
+            "LIMIT 21"
+        )
+        second = normalize(
+            'SELECT *  FROM t\n WHERE id IN (%s) AND name = %s LIMIT 10'
+        )
+        assert first == 'SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?'
+        assert fingerprint(first) == fingerprint(second), (
+            'Проверьте, что запросы, отличающиеся только значениями '
+            'параметров, получают один отпечаток.'
+        )
+
+    def test_02_log_entries(self, admin_client, client, slow_log):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/?genre=horror')
+        entries = [
+            entry for entry in read_log(slow_log)
+            if entry['view'] == 'api:title-list'
+        ]
+        assert entries, (
+            'Проверьте, что запросы дольше порога пишутся в журнал '
+            'с именем вызвавшего их представления.'
+        )
+        entry = entries[-1]
+        for key in ('duration_ms', 'fingerprint', 'sql', 'params', 'plan'):
+            assert key in entry, f'В записи журнала нет поля `{key}`.'
+        assert entry['action'] == 'list'
+        assert entry['sql'].startswith('SELECT')
+        assert all(isinstance(shape, str) for shape in entry['params'])
+        assert entry['plan'], (
+            'Проверьте, что для запросов SELECT в журнал пишется '
+            '`EXPLAIN QUERY PLAN`.'
+        )
+
+    def test_03_threshold(self, client, settings, slow_log):
+        settings.SLOW_QUERY_THRESHOLD_MS = 60_000
+        client.get('/api/v1/titles/')
+        with pytest.raises(FileNotFoundError):
+            read_log(slow_log)
+
+    def test_04_aggregate_command(self, admin_client, client, slow_log):
+        create_titles(admin_client)
+        for _ in range(3):
+            client.get('/api/v1/titles/?genre=horror')
+        out = StringIO()
+        call_command('slow_queries', log=slow_log, json=True, stdout=out)
+        groups = json.loads(out.getvalue())
+        assert len({group['fingerprint'] for group in groups}) == len(groups)
+        totals = [group['total_ms'] for group in groups]
+        assert totals == sorted(totals, reverse=True), (
+            'Проверьте, что группы запросов отсортированы по суммарному '
+            'времени.'
+        )
+        listed = [
+            group for group in groups if 'api:title-list' in group['views']
+        ]
+        assert any(group['count'] >= 3 for group in listed), (
+            'Проверьте, что повторяющиеся запросы объединяются в одну '
+            'группу по отпечатку.'
+        )
+        out = StringIO()
+        call_command('slow_queries', log=slow_log, stdout=out)
+        assert groups[0]['fingerprint'] in out.getvalue()
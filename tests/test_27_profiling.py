@@ -0,0 +1,73 @@
+import os
+import pstats
+
+import pytest
+
+from tests.test_24_server_timing import parse_server_timing
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Profiling:
+
+    def test_01_admin_profile(self, admin_client):
+        response = admin_client.get(
+            '/api/v1/titles/', HTTP_X_PROFILE='1'
+        )
+        assert response.status_code == 200
+        assert response.get('X-Profile') == 'ok', (
+            'Проверьте, что администратор может запросить профилирование '
+            'заголовком `X-Profile`.'
+        )
+        functions = parse_server_timing(response['X-Profile-Top'])
+        assert functions, (
+            'Проверьте, что ответ содержит самые затратные функции в '
+            'заголовке `X-Profile-Top`.'
+        )
+        for metric in functions.values():
+            assert float(metric['dur']) >= 0
+            assert metric['desc']
+        response = admin_client.get('/api/v1/titles/?profile=1')
+        assert response.get('X-Profile') == 'ok', (
+            'Проверьте, что профилирование можно запросить параметром '
+            '`profile`.'
+        )
+
+    def test_02_only_admins(self, user_client, moderator_client, client):
+        for api_client in (user_client, moderator_client, client):
+            response = api_client.get(
+                '/api/v1/categories/', HTTP_X_PROFILE='1'
+            )
+            assert 'X-Profile' not in response, (
+                'Проверьте, что профилирование доступно только '
+                'администраторам.'
+            )
+            assert 'X-Profile-Top' not in response
+
+    def test_03_rate_limit(self, admin_client, settings):
+        settings.PROFILING_RATE = '2/min'
+        statuses = [
+            admin_client.get(
+                '/api/v1/categories/', HTTP_X_PROFILE='1'
+            ) for _ in range(3)
+        ]
+        assert [response.status_code for response in statuses] == [200] * 3
+        assert [response['X-Profile'] for response in statuses] == [
+            'ok', 'ok', 'throttled'
+        ], (
+            'Проверьте, что частота профилирования ограничена '
+            'настройкой `PROFILING_RATE`.'
+        )
+        assert 'X-Profile-Top' not in statuses[-1]
+
+    def test_04_save_profile(self, admin_client, settings, tmp_path):
+        settings.PROFILING_DIR = str(tmp_path)
+        response = admin_client.get(
+            '/api/v1/genres/', HTTP_X_PROFILE='1'
+        )
+        name = response['X-Profile-File']
+        assert name.endswith('.prof')
+        assert os.listdir(tmp_path) == [name], (
+            'Проверьте, что профиль сохраняется в `PROFILING_DIR`.'
+        )
+        stats = pstats.Stats(os.path.join(tmp_path, name))
+        assert stats.total_calls > 0
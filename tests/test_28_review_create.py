@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_titles
+
+
+def review_url(title_id):
+    return f'/api/v1/titles/{title_id}/reviews/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ReviewCreate:
+
+    def test_01_single_round_trip(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                review_url(title_id), data={'text': 'Отзыв', 'score': 7}
+            )
+        assert response.status_code == 201
+        assert response.json()['title'] == title_id
+        selects = [
+            query['sql'] for query in context
+            if query['sql'].startswith('SELECT') and (
+                'reviews_review' in query['sql']
+                or 'reviews_title' in query['sql']
+            )
+        ]
+        assert not selects, (
+            'Проверьте, что при создании отзыва произведение и '
+            'уникальность отзыва не проверяются отдельными запросами: '
+            f'{selects}'
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.score_count) == (7, 1)
+
+    def test_02_duplicate_review(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        user_client.post(
+            review_url(title_id), data={'text': 'Отзыв', 'score': 7}
+        )
+        response = user_client.post(
+            review_url(title_id), data={'text': 'Ещё отзыв', 'score': 2}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение возвращает '
+            'ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Entry already exists.']
+        }
+        assert Review.objects.filter(title_id=title_id).count() == 1
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.score_count) == (7, 1), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг '
+            'произведения.'
+        )
+
+    def test_03_missing_title(self, user_client):
+        response = user_client.post(
+            review_url(9999), data={'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что отзыв на несуществующее произведение '
+            'возвращает ответ со статусом 404.'
+        )
+        assert not Review.objects.exists()
+
+    def test_04_missing_title_in_request_transaction(
+        self, user_client, monkeypatch
+    ):
+        monkeypatch.setitem(connection.settings_dict, 'ATOMIC_REQUESTS', True)
+        response = user_client.post(
+            review_url(9999), data={'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что несуществующее произведение обнаруживается до '
+            'фиксации транзакции запроса.'
+        )
+        assert not Review.objects.exists()
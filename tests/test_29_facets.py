@@ -0,0 +1,89 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/'
+
+
+def counts(facet, key='slug'):
+    return {item[key]: item['count'] for item in facet}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Facets:
+
+    def test_01_facet_counts(self, admin_client, client):
+        create_titles(admin_client)
+        admin_client.post(URL, data={
+            'name': 'Чужой', 'year': 1984, 'genre': ['horror', 'drama'],
+            'category': 'films'
+        })
+        response = client.get(URL, {'facets': 'category,genre,year'})
+        assert response.status_code == 200
+        data = response.json()
+        assert 'results' in data and 'facets' in data, (
+            'Проверьте, что параметр `facets` добавляет к списку '
+            'произведений ключ `facets`, не убирая результаты.'
+        )
+        facets = data['facets']
+        assert counts(facets['category']) == {'films': 2, 'books': 1}
+        assert counts(facets['genre']) == {
+            'horror': 2, 'comedy': 1, 'drama': 2
+        }
+        assert counts(facets['year'], 'year') == {1984: 2, 1988: 1}
+        assert facets['category'][0] == {
+            'slug': 'films', 'name': 'Фильм', 'count': 2
+        }
+        assert 'facets' not in client.get(URL).json()
+
+    def test_02_follow_filter(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(URL, {'facets': 'genre,year', 'genre': 'drama'})
+        facets = response.json()['facets']
+        assert counts(facets['genre']) == {'drama': 1}, (
+            'Проверьте, что фасеты считаются для произведений, '
+            'отобранных фильтрами `TitleFilter`.'
+        )
+        assert counts(facets['year'], 'year') == {1988: 1}
+        response = client.get(URL, {'facets': 'genre', 'genre': 'unknown'})
+        assert response.json()['facets'] == {'genre': []}
+
+    def test_03_query_per_facet(self, admin_client, client):
+        create_titles(admin_client)
+        client.get(URL)
+        with CaptureQueriesContext(connection) as plain:
+            client.get(URL, {'page': 1})
+        with CaptureQueriesContext(connection) as faceted:
+            client.get(URL, {'facets': 'category,genre,year'})
+        assert len(faceted) - len(plain) <= 3, (
+            'Проверьте, что каждый фасет считается не более чем одним '
+            'агрегирующим запросом.'
+        )
+        with CaptureQueriesContext(connection) as cached:
+            client.get(URL, {'facets': 'category,genre,year', 'page': 1})
+        assert len(cached) == len(plain), (
+            'Проверьте, что фасеты кешируются по параметрам фильтра и не '
+            'пересчитываются при переходе по страницам.'
+        )
+
+    def test_04_invalidation(self, admin_client, client):
+        create_titles(admin_client)
+        client.get(URL, {'facets': 'year'})
+        admin_client.post(URL, data={
+            'name': 'Чужой', 'year': 1979, 'genre': ['horror'],
+            'category': 'films'
+        })
+        facets = client.get(URL, {'facets': 'year', 'page': 1}).json()
+        assert counts(facets['facets']['year'], 'year') == {
+            1979: 1, 1984: 1, 1988: 1
+        }, 'Проверьте, что кеш фасетов сбрасывается при изменении данных.'
+
+    def test_05_unknown_facet(self, client):
+        response = client.get(URL, {'facets': 'year,rating'})
+        assert response.status_code == 400, (
+            'Проверьте, что неизвестный фасет возвращает ответ со '
+            'статусом 400.'
+        )
+        assert 'facets' in response.json()
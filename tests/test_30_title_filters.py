@@ -0,0 +1,91 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/'
+
+
+def names(response):
+    assert response.status_code == 200, response.json()
+    return sorted(title['name'] for title in response.json()['results'])
+
+
+@pytest.fixture
+def titles(admin_client):
+    create_titles(admin_client)
+    for data in (
+        {'name': 'Чужой', 'year': 1979, 'genre': ['horror', 'drama'],
+         'category': 'films'},
+        {'name': 'Мгла', 'year': 2007, 'genre': ['horror'],
+         'category': 'books'},
+    ):
+        response = admin_client.post(URL, data=data)
+        assert response.status_code == 201
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30TitleFilters:
+
+    def test_01_any_genre(self, client, titles):
+        response = client.get(URL, {'genre': 'comedy,drama'})
+        assert names(response) == [
+            'Крепкий орешек', 'Терминатор', 'Чужой'
+        ], (
+            'Проверьте, что `genre=a,b` возвращает произведения хотя бы '
+            'с одним из жанров.'
+        )
+        response = client.get(URL, {'genre': 'horror,drama'})
+        assert response.json()['count'] == 4, (
+            'Проверьте, что произведение с несколькими подходящими '
+            'жанрами попадает в выдачу один раз.'
+        )
+        assert names(client.get(URL, {'genre': 'comedy,unknown'})) == [
+            'Терминатор'
+        ]
+
+    def test_02_all_genres(self, client, titles):
+        response = client.get(
+            URL, {'genre': 'horror,drama', 'genre_match': 'all'}
+        )
+        assert names(response) == ['Чужой'], (
+            'Проверьте, что `genre_match=all` возвращает только '
+            'произведения со всеми указанными жанрами.'
+        )
+        response = client.get(
+            URL, {'genre': 'horror,unknown', 'genre_match': 'all'}
+        )
+        assert names(response) == []
+        response = client.get(URL, {'genre': 'horror', 'genre_match': 'all'})
+        assert len(names(response)) == 3
+
+    def test_03_categories_and_years(self, client, titles):
+        assert names(client.get(URL, {'category': 'films,books'})) == [
+            'Крепкий орешек', 'Мгла', 'Терминатор', 'Чужой'
+        ]
+        assert names(client.get(URL, {'category': 'unknown'})) == []
+        response = client.get(URL, {'year_min': 1980, 'year_max': 1989})
+        assert names(response) == ['Крепкий орешек', 'Терминатор'], (
+            'Проверьте фильтрацию по диапазону лет `year_min`/`year_max`.'
+        )
+        response = client.get(URL, {'year_min': 2000, 'genre': 'horror'})
+        assert names(response) == ['Мгла']
+
+    def test_04_no_join_duplicates(self, client, titles):
+        with CaptureQueriesContext(connection) as context:
+            client.get(URL, {'genre': 'horror,drama', 'genre_match': 'all'})
+        joins = [
+            query['sql'] for query in context
+            if 'FROM "reviews_title" ' in query['sql']
+            and 'JOIN "reviews_title_genre"' in query['sql']
+        ]
+        assert not joins, (
+            'Проверьте, что фильтр по жанрам не присоединяет таблицу '
+            f'связей к списку произведений: {joins}'
+        )
+
+    def test_05_invalid_match(self, client):
+        response = client.get(URL, {'genre': 'horror', 'genre_match': 'most'})
+        assert response.status_code == 400
+        assert 'genre_match' in response.json()
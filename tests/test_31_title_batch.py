@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/batch/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31TitleBatch:
+
+    def test_01_order_and_missing(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        response = client.get(URL, {'ids': f'{second},9999,{first},{second}'})
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/titles/batch/?ids=...` доступен '
+            'без авторизации.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            second, first
+        ], (
+            'Проверьте, что произведения возвращаются в порядке '
+            'запрошенных идентификаторов без повторов.'
+        )
+        assert data['missing'] == [9999], (
+            'Проверьте, что отсутствующие идентификаторы перечислены '
+            'в поле `missing`.'
+        )
+        detail = client.get(f'/api/v1/titles/{first}/').json()
+        assert data['results'][1] == detail, (
+            'Проверьте, что пакетный запрос возвращает произведения в том '
+            'же виде, что и запрос одного произведения.'
+        )
+
+    def test_02_constant_queries(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre{idx}')
+            for idx in range(3)
+        ]
+        ids = []
+        for idx in range(60):
+            title = Title.objects.create(
+                name=f'Фильм {idx}', year=2000, category=category
+            )
+            title.genre.set(genres[:idx % 3 + 1])
+            ids.append(title.pk)
+        counts = []
+        for size in (5, 60):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(
+                    URL, {'ids': ','.join(map(str, ids[:size]))}
+                )
+            assert len(response.json()['results']) == size
+            counts.append(len(context))
+        assert counts[0] == counts[1] <= 2, (
+            'Проверьте, что число SQL-запросов пакетного запроса не '
+            f'зависит от числа произведений: {counts}.'
+        )
+
+    def test_03_invalid_ids(self, client):
+        for ids in ('', '1,a', ','.join(map(str, range(1, 202))), '1,²',
+                    '1,99999999999999999999999', '0'):
+            response = client.get(URL, {'ids': ids})
+            assert response.status_code == 400, (
+                f'Проверьте, что запрос с ids=`{ids[:20]}` возвращает '
+                'ответ со статусом 400.'
+            )
+            assert 'ids' in response.json()
@@ -0,0 +1,212 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import NotSupportedError, connection, transaction
+from django.db.models.signals import m2m_changed
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import assign_inserted_pks
+from reviews.models import Category, Title
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/bulk/'
+
+
+def new_titles(count, genre=('horror',), category='films'):
+    return [
+        {
+            'name': f'Фильм {idx}',
+            'year': 2000 + idx % 20,
+            'genre': list(genre),
+            'category': category,
+        }
+        for idx in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32TitleBulk:
+
+    def test_01_bulk_create(self, admin_client, client):
+        create_titles(admin_client)
+        data = new_titles(3, genre=('horror', 'drama'))
+        response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        created = response.json()
+        assert [title['name'] for title in created] == [
+            title['name'] for title in data
+        ]
+        for title in created:
+            assert sorted(title['genre']) == ['drama', 'horror']
+            assert title['category'] == 'films'
+            stored = Title.objects.get(pk=title['id'])
+            assert stored.name == title['name'], (
+                'Проверьте, что в ответе возвращаются идентификаторы '
+                'созданных произведений.'
+            )
+        listed = client.get('/api/v1/titles/', {'genre': 'drama'}).json()
+        assert listed['count'] == 4, (
+            'Проверьте, что массовое создание сбрасывает кеш списка '
+            'произведений.'
+        )
+
+    def test_02_constant_queries(self, admin_client):
+        create_titles(admin_client)
+        counts = []
+        for size in (2, 50):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    URL, data=new_titles(size), format='json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            counts.append(len(context))
+        assert counts[0] == counts[1], (
+            'Проверьте, что массовое создание выполняет одинаковое число '
+            f'SQL-запросов для любого числа произведений: {counts}.'
+        )
+
+    def test_03_per_item_errors(self, admin_client):
+        create_titles(admin_client)
+        before = Title.objects.count()
+        data = new_titles(3)
+        data[1]['category'] = 'unknown'
+        data[2]['year'] = 3000
+        response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3 and errors[0] == {}, (
+            'Проверьте, что ошибки валидации возвращаются для каждого '
+            'элемента списка.'
+        )
+        assert 'category' in errors[1] and 'year' in errors[2]
+        assert Title.objects.count() == before, (
+            'Проверьте, что при ошибках не создаётся ни одно произведение.'
+        )
+
+    def test_04_bulk_update_single_statement(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.post(URL, data=new_titles(20), format='json')
+        ids = list(Title.objects.values_list('pk', flat=True))
+        data = [{'id': pk, 'category': 'books'} for pk in ids]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK, response.json()
+        updates = [
+            query['sql'] for query in context
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]
+        assert len(updates) == 1, (
+            'Проверьте, что одинаковое изменение многих произведений '
+            'выполняется одним запросом UPDATE.'
+        )
+        books = Category.objects.get(slug='books')
+        assert set(
+            Title.objects.values_list('category', flat=True)
+        ) == {books.pk}
+        assert all(title['category'] == 'books' for title in response.json())
+
+    def test_05_bulk_update_different_values(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data = [
+            {'id': titles[0]['id'], 'name': 'Терминатор 2',
+             'genre': ['comedy']},
+            {'id': titles[1]['id'], 'name': 'Крепкий орешек 2'},
+        ]
+        response = admin_client.patch(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK, response.json()
+        first = Title.objects.get(pk=titles[0]['id'])
+        second = Title.objects.get(pk=titles[1]['id'])
+        assert (first.name, second.name) == (
+            'Терминатор 2', 'Крепкий орешек 2'
+        )
+        assert list(first.genre.values_list('slug', flat=True)) == [
+            'comedy'
+        ]
+        assert second.genre.count() == 1
+        assert second.year == titles[1]['year']
+
+    def test_06_bulk_update_errors(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data = [
+            {'id': titles[0]['id'], 'name': 'Новое название'},
+            {'id': 9999, 'name': 'Нет такого'},
+            {'name': 'Без идентификатора'},
+            {'id': titles[0]['id'], 'year': 1990},
+            {'id': 99999999999999999999999, 'name': 'Слишком большой'},
+            {'id': 0, 'name': 'Ноль'},
+            {'id': True, 'name': 'Логическое значение'},
+        ]
+        response = admin_client.patch(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {} and all('id' in error for error in errors[1:])
+        assert Title.objects.get(pk=titles[0]['id']).name == 'Терминатор'
+
+    def test_07_admin_only(self, user_client, moderator_client, client):
+        data = json.dumps(new_titles(1))
+        for api_client in (user_client, moderator_client, client):
+            response = api_client.post(
+                URL, data=data, content_type='application/json'
+            )
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), 'Проверьте, что массовые операции доступны только админу.'
+            response = api_client.patch(
+                URL, data='[]', content_type='application/json'
+            )
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            )
+
+    def test_08_inserted_pks_need_sqlite_transaction(self, monkeypatch):
+        titles = [Title(name='Фильм', year=2000)]
+        monkeypatch.setattr(
+            connection.features, 'can_return_rows_from_bulk_insert', False
+        )
+        with pytest.raises(NotSupportedError):
+            assign_inserted_pks(titles)
+        monkeypatch.setattr(connection, 'vendor', 'mysql')
+        with pytest.raises(NotSupportedError):
+            with transaction.atomic():
+                assign_inserted_pks(titles)
+
+    def test_09_bulk_update_genre_diff(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        through = Title.genre.through
+        first, second = titles[0]['id'], titles[1]['id']
+        kept = through.objects.get(
+            title_id=first, genre__slug=genres[1]['slug']
+        ).pk
+        untouched = through.objects.get(title_id=second).pk
+        actions = []
+
+        def receiver(sender, instance, action, pk_set, **kwargs):
+            actions.append((instance.pk, action, len(pk_set)))
+
+        m2m_changed.connect(receiver, sender=through)
+        try:
+            response = admin_client.patch(URL, data=[
+                {'id': first,
+                 'genre': [genres[1]['slug'], genres[2]['slug']]},
+                {'id': second, 'genre': [genres[2]['slug']]},
+            ], format='json')
+        finally:
+            m2m_changed.disconnect(receiver, sender=through)
+        assert response.status_code == HTTPStatus.OK, response.json()
+        assert through.objects.filter(pk__in=[kept, untouched]).count() == 2, (
+            'Проверьте, что массовое изменение жанров не пересоздаёт '
+            'сохранившиеся связи.'
+        )
+        assert sorted(
+            through.objects.filter(title_id=first).values_list(
+                'genre__slug', flat=True
+            )
+        ) == sorted([genres[1]['slug'], genres[2]['slug']])
+        assert sorted(actions) == [
+            (first, 'post_add', 1), (first, 'post_remove', 1),
+            (first, 'pre_add', 1), (first, 'pre_remove', 1),
+        ], (
+            'Проверьте, что массовое изменение жанров отправляет сигнал '
+            '`m2m_changed` только для изменившихся связей.'
+        )